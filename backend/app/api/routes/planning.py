@@ -189,17 +189,23 @@ async def evaluate_actions(request: EvaluateActionsRequest):
             # Load the requested model
             await inference.loader.load_model_async(request.model)
 
-        # Evaluate actions
-        result = inference.evaluate_actions(
-            current_image=current_img,
-            goal_image=goal_img,
-            actions=request.actions
+        def evaluate_and_clear():
+            result = inference.evaluate_actions(
+                current_image=current_img,
+                goal_image=goal_img,
+                actions=request.actions
+            )
+            # CRITICAL: Clear cache after evaluation to prevent memory buildup
+            # This is essential for stable multi-step planning
+            inference.clear_cache(aggressive=True)
+            return result
+
+        # Evaluate actions on the planner's inference thread so this work is
+        # serialized with planning and deferred memory cleanup
+        result = await asyncio.get_running_loop().run_in_executor(
+            planner._inference_executor, evaluate_and_clear
         )
 
-        # CRITICAL: Clear cache after evaluation to prevent memory buildup
-        # This is essential for stable multi-step planning
-        inference.clear_cache(aggressive=True)
-
         # Explicitly delete PIL Image objects
         del current_img
         del goal_img
@@ -299,10 +305,15 @@ async def get_trajectory_status(task_id: str):
     if not task:
         raise HTTPException(status_code=404, detail="Trajectory task not found")
 
+    # Streamed progress only carries step deltas; give pollers the full list
+    progress = task.progress
+    if progress is not None:
+        progress = progress.model_copy(update={"completed_steps": list(task.completed_steps)})
+
     return TrajectoryResultResponse(
         task_id=task.id,
         status=task.status,
-        progress=task.progress,
+        progress=progress,
         result=task.result,
         error=task.error,
     )
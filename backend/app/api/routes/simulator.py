@@ -3,7 +3,6 @@
 import io
 import logging
 import base64
-import hashlib
 from typing import List, Optional
 
 import numpy as np
@@ -17,7 +16,7 @@ logger = logging.getLogger(__name__)
 
 def _compute_image_stats(img: Image.Image) -> dict:
     """Compute diagnostic statistics for an image to detect black/corrupted frames."""
-    img_array = np.array(img)
+    img_array = np.asarray(img)
     nonzero_count = int(np.count_nonzero(img_array))
     total_pixels = int(img_array.size)
     return {
@@ -26,9 +25,16 @@ def _compute_image_stats(img: Image.Image) -> dict:
         "max": float(img_array.max()),
         "mean": float(img_array.mean()),
         "nonzero_pct": float(nonzero_count / total_pixels * 100) if total_pixels > 0 else 0,
-        "md5": hashlib.md5(img_array.tobytes()).hexdigest()[:12],
     }
 
+
+def _encode_jpeg_base64(img: Image.Image) -> str:
+    """Encode a frame as base64 JPEG for the JSON responses."""
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=90)
+    # getbuffer() exposes the encoded bytes without the extra copy getvalue() makes
+    return base64.b64encode(buffer.getbuffer()).decode("ascii")
+
 router = APIRouter(prefix="/simulator", tags=["simulator"])
 
 # Global simulator instance (lazy loaded)
@@ -46,6 +52,15 @@ class SimulatorStepRequest(BaseModel):
     )
 
 
+class SimulatorStepSequenceRequest(BaseModel):
+    """Request to execute a sequence of actions in the simulator."""
+    actions: List[List[float]] = Field(
+        ...,
+        min_length=1,
+        description="List of 7-DOF actions: [x, y, z, roll, pitch, yaw, gripper]"
+    )
+
+
 class SimulatorStepResponse(BaseModel):
     """Response from simulator step."""
     success: bool
@@ -133,16 +148,15 @@ async def initialize_simulator(task: str = "Lift"):
         _simulator_initialized = True
 
         # Diagnostic: Check initial image stats
-        img_stats = _compute_image_stats(initial_image)
-        logger.info(
-            f"[Simulator] Init frame stats: nonzero={img_stats['nonzero_pct']:.1f}%, "
-            f"mean={img_stats['mean']:.1f}, md5={img_stats['md5']}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            img_stats = _compute_image_stats(initial_image)
+            logger.info(
+                f"[Simulator] Init frame stats: nonzero={img_stats['nonzero_pct']:.1f}%, "
+                f"mean={img_stats['mean']:.1f}"
+            )
 
         # Convert PIL Image to base64
-        buffer = io.BytesIO()
-        initial_image.save(buffer, format="JPEG", quality=90)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        image_base64 = _encode_jpeg_base64(initial_image)
 
         logger.info("[Simulator] Initialized successfully")
 
@@ -190,38 +204,34 @@ async def step_simulator(request: SimulatorStepRequest):
             logger.warning(
                 f"[Simulator] ⚠️ CORRUPTED FRAME DETECTED before encoding! "
                 f"nonzero={img_stats['nonzero_pct']:.1f}%, mean={img_stats['mean']:.1f}, "
-                f"md5={img_stats['md5']}, shape={img_stats['shape']}"
+                f"shape={img_stats['shape']}"
             )
         else:
             logger.info(
                 f"[Simulator] Frame stats: nonzero={img_stats['nonzero_pct']:.1f}%, "
-                f"mean={img_stats['mean']:.1f}, md5={img_stats['md5']}"
+                f"mean={img_stats['mean']:.1f}"
             )
 
-        # Convert PIL Image to base64
-        buffer = io.BytesIO()
-        result["image"].save(buffer, format="JPEG", quality=90)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
-
+        image = result["image"]
         message = "Action executed successfully"
 
         # Auto-reset if episode is done (horizon reached or task completed)
         if result["done"]:
             logger.info("[Simulator] Episode done, auto-resetting environment")
-            reset_image = sim.reset()
-            # Use the reset image instead
-            buffer = io.BytesIO()
-            reset_image.save(buffer, format="JPEG", quality=90)
-            image_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
+            # Use the reset image instead (so the step frame is never encoded)
+            image = sim.reset()
             message = "Episode ended (horizon reached). Environment auto-reset."
 
+        # Convert PIL Image to base64
+        image_base64 = _encode_jpeg_base64(image)
+
         logger.info(f"[Simulator] Step completed, reward: {result['reward']}, done: {result['done']}")
 
         return SimulatorStepResponse(
             success=result["success"],
             image_base64=image_base64,
-            robot_state=result["robot_state"].tolist() if result["robot_state"] is not None else None,
-            gripper_state=result["gripper_state"].tolist() if result["gripper_state"] is not None else None,
+            robot_state=result["robot_state"],
+            gripper_state=result["gripper_state"],
             reward=result["reward"],
             done=result["done"],
             raw_action=result["raw_action"],
@@ -236,6 +246,61 @@ async def step_simulator(request: SimulatorStepRequest):
         raise HTTPException(status_code=500, detail=f"Simulator step failed: {str(e)}")
 
 
+@router.post("/step-sequence")
+async def step_simulator_sequence(request: SimulatorStepSequenceRequest):
+    """
+    Execute a sequence of actions and return only the final observation.
+
+    Intermediate steps are not rendered. Stops early if the episode ends, in which
+    case the environment is automatically reset (as with /step).
+    """
+    logger.info(f"[Simulator] Step-sequence request with {len(request.actions)} actions")
+
+    try:
+        sim = get_simulator()
+
+        if not sim.is_initialized():
+            raise HTTPException(
+                status_code=400,
+                detail="Simulator not initialized. Call /simulator/init first."
+            )
+
+        try:
+            result = sim.execute_actions(request.actions)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+        image = result["image"]
+        message = f"Executed {result['steps_executed']} actions"
+
+        # Auto-reset if episode is done (horizon reached or task completed)
+        if result["done"]:
+            logger.info("[Simulator] Episode done, auto-resetting environment")
+            image = sim.reset()
+            message = f"Episode ended after {result['steps_executed']} actions. Environment auto-reset."
+
+        image_base64 = _encode_jpeg_base64(image)
+
+        return {
+            "success": result["success"],
+            "image_base64": image_base64,
+            "robot_state": result["robot_state"],
+            "gripper_state": result["gripper_state"],
+            "rewards": result["rewards"],
+            "reward": result["reward"],
+            "done": result["done"],
+            "steps_executed": result["steps_executed"],
+            "transformed_actions": result["transformed_actions"],
+            "message": message,
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[Simulator] Step-sequence failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Simulator step-sequence failed: {str(e)}")
+
+
 @router.post("/reset")
 async def reset_simulator():
     """
@@ -259,9 +324,7 @@ async def reset_simulator():
         initial_image = sim.reset()
 
         # Convert PIL Image to base64
-        buffer = io.BytesIO()
-        initial_image.save(buffer, format="JPEG", quality=90)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        image_base64 = _encode_jpeg_base64(initial_image)
 
         logger.info("[Simulator] Reset completed")
 
@@ -306,7 +369,7 @@ async def save_simulator_state():
     Save current simulator state and return as downloadable file.
 
     Returns:
-        Binary .pkl file containing simulator state (qpos, qvel, task, etc.)
+        Binary .npz file containing simulator state (qpos, qvel, task, etc.)
     """
     logger.info("[Simulator] Save state request")
 
@@ -325,7 +388,7 @@ async def save_simulator_state():
             content=state_bytes,
             media_type="application/octet-stream",
             headers={
-                "Content-Disposition": f"attachment; filename=simulator_state_{sim.task}.pkl"
+                "Content-Disposition": f"attachment; filename=simulator_state_{sim.task}.npz"
             }
         )
 
@@ -339,10 +402,10 @@ async def save_simulator_state():
 @router.post("/load-state")
 async def load_simulator_state(file: UploadFile = File(...)):
     """
-    Load simulator state from uploaded .pkl file.
+    Load simulator state from uploaded .npz file.
 
     Args:
-        file: Uploaded .pkl state file
+        file: Uploaded .npz state file
 
     Returns:
         New observation image after restoring state
@@ -364,9 +427,7 @@ async def load_simulator_state(file: UploadFile = File(...)):
         _simulator_initialized = True
 
         # Convert to base64
-        buffer = io.BytesIO()
-        image.save(buffer, format="JPEG", quality=90)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        image_base64 = _encode_jpeg_base64(image)
 
         logger.info(f"[Simulator] State loaded successfully for task: {sim.task}")
 
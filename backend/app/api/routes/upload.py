@@ -29,6 +29,9 @@ MAX_UPLOADS = 100
 
 def _cleanup_old_uploads():
     """Remove uploads older than TTL or if exceeding max count."""
+    # Import here to avoid circular imports
+    from app.services.planner import forget_upload_image
+
     current_time = time.time()
 
     # Remove expired uploads
@@ -38,6 +41,7 @@ def _cleanup_old_uploads():
     ]
     for uid in expired_ids:
         del _uploads[uid]
+        forget_upload_image(uid)
         logger.debug(f"Cleaned up expired upload: {uid}")
 
     # If still over limit, remove oldest
@@ -49,6 +53,7 @@ def _cleanup_old_uploads():
         to_remove = len(_uploads) - MAX_UPLOADS
         for uid, _ in sorted_uploads[:to_remove]:
             del _uploads[uid]
+            forget_upload_image(uid)
             logger.debug(f"Cleaned up old upload (over limit): {uid}")
 
 
@@ -34,10 +34,15 @@ class Settings(BaseSettings):
     # Inference settings
     use_fp16: bool = True  # Use FP16 for memory efficiency
     max_batch_size: int = 1  # Conservative for 16GB
+    torch_num_threads: int = 4  # Intra-op threads for the inference worker (avoids oversubscription)
+    enable_torch_compile: bool = False  # torch.compile the encoder and AC predictor (experimental on MPS)
+    encoder_int8_weights: bool = False  # Store encoder linear weights as int8 (less memory, small accuracy cost)
+    mps_memory_fraction: float = 0.85  # Cap on MPS allocations (fraction of GPU budget, 0 = no cap)
 
     # Checkpointing settings
     enable_checkpointing: bool = True  # Enable disk-based model checkpointing
     checkpoint_max_age_days: int = 30  # Auto-delete checkpoints older than 30 days
+    force_checkpoint_checksum: bool = False  # Re-hash checkpoints on every load, even if unchanged on disk
 
     class Config:
         env_file = ".env"
@@ -112,9 +112,17 @@ async def websocket_planning(websocket: WebSocket, task_id: str):
         elif active_task.status == "running" and active_task.progress:
             # Send current progress (including loading_model status)
             msg_type = "trajectory_progress" if is_trajectory else "progress"
+            progress = active_task.progress
+            if is_trajectory:
+                # Streamed progress only carries step deltas; a (re)connecting
+                # client needs the full list of steps finished so far
+                progress = progress.model_copy(update={
+                    "completed_steps": list(trajectory_task.completed_steps),
+                    "new_completed_step": None,
+                })
             await websocket.send_json({
                 "type": msg_type,
-                "data": active_task.progress.model_dump()
+                "data": progress.model_dump()
             })
 
         # Keep connection open to receive updates
@@ -136,8 +136,10 @@ class TrajectoryProgress(BaseModel):
     samples_evaluated: int = 0
     elapsed_seconds: float = 0.0
     eta_seconds: float = 0.0
-    # Completed steps so far
-    completed_steps: List[TrajectoryStep] = []
+    # Full list of completed steps - only sent in the initial snapshot
+    completed_steps: Optional[List[TrajectoryStep]] = None
+    # Step finished since the previous update (clients append it to their list)
+    new_completed_step: Optional[TrajectoryStep] = None
 
 
 class TrajectoryResult(BaseModel):
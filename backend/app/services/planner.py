@@ -1,13 +1,18 @@
 """Planning service with real V-JEPA2 inference."""
 
 import asyncio
+import heapq
 import io
 import logging
+import math
+import statistics
+import threading
 import time
 import uuid
-from typing import Dict, Callable, Optional
-from dataclasses import dataclass
-from collections import OrderedDict
+from typing import Dict, Callable, Optional, Tuple
+from dataclasses import dataclass, field
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 from PIL import Image
 
@@ -25,7 +30,178 @@ from app.config import settings
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _init_inference_thread() -> None:
+    """Pin PyTorch's intra-op pool size on the dedicated inference worker."""
+    import torch
+    torch.set_num_threads(settings.torch_num_threads)
+
+
+# Upper bound on decoded pixel data kept by _decode_upload_image
+_DECODED_UPLOADS_MAX_BYTES = 64 * 1024 * 1024
+
+_decoded_uploads: "OrderedDict[str, Tuple[Image.Image, int]]" = OrderedDict()
+_decoded_uploads_bytes = 0
+_decoded_uploads_lock = threading.Lock()
+
+
+def _decode_upload_image(upload_id: str) -> Image.Image:
+    """
+    Decode an uploaded image once and reuse it across planning runs.
+
+    Upload IDs are immutable (a new upload always gets a new ID), so caching by
+    ID is safe. The cache is LRU, bounded by decoded size, and entries are
+    dropped when the upload itself is removed. Pixel data is loaded eagerly
+    since Image.open is lazy. Callers must treat the returned image as read-only.
+    """
+    global _decoded_uploads_bytes
+    from app.api.routes.upload import _uploads
+
+    with _decoded_uploads_lock:
+        entry = _decoded_uploads.get(upload_id)
+        if entry is not None:
+            _decoded_uploads.move_to_end(upload_id)
+            return entry[0]
+
+    image = Image.open(io.BytesIO(_uploads[upload_id]["content"]))
+    image.load()
+    size = image.width * image.height * len(image.getbands())
+    if size > _DECODED_UPLOADS_MAX_BYTES:
+        return image
+
+    with _decoded_uploads_lock:
+        if upload_id not in _decoded_uploads:
+            _decoded_uploads[upload_id] = (image, size)
+            _decoded_uploads_bytes += size
+            while _decoded_uploads_bytes > _DECODED_UPLOADS_MAX_BYTES:
+                _, (_, evicted_size) = _decoded_uploads.popitem(last=False)
+                _decoded_uploads_bytes -= evicted_size
+    return image
+
+
+def forget_upload_image(upload_id: str) -> None:
+    """Drop the decoded copy of a removed upload from the decode cache."""
+    global _decoded_uploads_bytes
+    with _decoded_uploads_lock:
+        entry = _decoded_uploads.pop(upload_id, None)
+        if entry is not None:
+            _decoded_uploads_bytes -= entry[1]
+
+
+class _ProgressCoalescer:
+    """
+    Coalesces progress updates posted from executor threads.
+
+    CEM reports progress every iteration, which used to create one coroutine
+    (and one WebSocket message) per update. Updates are now parked in a single
+    pending slot and sent by one flush coroutine at most every MIN_INTERVAL
+    seconds; if the client falls behind, intermediate updates are replaced by
+    the newest one.
+    """
+
+    MIN_INTERVAL = 0.05  # 50ms between sends
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Callable):
+        self._loop = loop
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._pending = None
+        self._flush_scheduled = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_sent = 0.0
+
+    def submit(self, progress) -> None:
+        """Queue a progress update (safe to call from any thread)."""
+        with self._lock:
+            self._pending = progress
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self._loop.call_soon_threadsafe(self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._flush_task = self._loop.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        while True:
+            now = time.monotonic()
+            wait = self.MIN_INTERVAL - (now - self._last_sent)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now += wait
+
+            with self._lock:
+                progress = self._pending
+                self._pending = None
+                if progress is None:
+                    self._flush_scheduled = False
+                    return
+
+            self._last_sent = now
+            try:
+                await self._callback(progress)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+    async def drain(self) -> None:
+        """Wait until the latest queued update has been sent."""
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+
+
+class _StepProgressReporter:
+    """
+    CEM progress callback for trajectory planning, reused across steps.
+
+    The planner updates `step` and `history` at the start of each step instead
+    of defining a new closure per step.
+    """
+
+    __slots__ = ("task", "num_steps", "samples", "coalescer", "step", "history")
+
+    def __init__(self, task: "TrajectoryTask", num_steps: int, samples: int,
+                 coalescer: Optional[_ProgressCoalescer]):
+        self.task = task
+        self.num_steps = num_steps
+        self.samples = samples
+        self.coalescer = coalescer
+        self.step = 0
+        self.history: list[float] = []  # Energy history of the current step
+
+    def __call__(self, iteration: int, total: int, best_energy: float, best_action) -> None:
+        task = self.task
+        if task.cancelled:
+            raise asyncio.CancelledError("Task cancelled by user")
+
+        self.history.append(round(best_energy, 3))
+
+        elapsed = time.monotonic() - task.start_time
+        # Estimate total time: (elapsed / (completed_steps + current_progress)) * total_steps
+        steps_done = self.step + (iteration / total if total > 0 else 0)
+        if steps_done > 0:
+            eta = (elapsed / steps_done) * (self.num_steps - steps_done)
+        else:
+            eta = 0
+
+        progress = TrajectoryProgress(
+            status="running",
+            current_step=self.step,
+            total_steps=self.num_steps,
+            iteration=iteration,
+            total_iterations=total,
+            best_energy=round(best_energy, 3),
+            energy_history=self.history,  # Pydantic copies the list on validation
+            samples_evaluated=iteration * self.samples,
+            elapsed_seconds=round(elapsed, 1),
+            eta_seconds=round(eta, 1),
+        )
+
+        task.progress = progress
+
+        if self.coalescer:
+            self.coalescer.submit(progress)
+
+
+@dataclass(slots=True)
 class PlanningTask:
     """Represents a planning task."""
     id: str
@@ -35,10 +211,10 @@ class PlanningTask:
     result: Optional[ActionResult] = None
     error: Optional[str] = None
     cancelled: bool = False
-    start_time: Optional[float] = None
+    start_time: Optional[float] = None  # Monotonic clock (elapsed/ETA and TTL eviction)
 
 
-@dataclass
+@dataclass(slots=True)
 class TrajectoryTask:
     """Represents a trajectory planning task."""
     id: str
@@ -48,7 +224,9 @@ class TrajectoryTask:
     result: Optional[TrajectoryResult] = None
     error: Optional[str] = None
     cancelled: bool = False
-    start_time: Optional[float] = None
+    start_time: Optional[float] = None  # Monotonic clock (elapsed/ETA and TTL eviction)
+    # Steps finished so far; progress updates only carry the newest one
+    completed_steps: list[TrajectoryStep] = field(default_factory=list)
 
 
 class PlannerService:
@@ -61,57 +239,157 @@ class PlannerService:
     # Task cleanup settings optimized for 16GB RAM
     MAX_TASKS = 100  # Keep last 100 tasks
     TASK_TTL_SECONDS = 3600  # 1 hour TTL
+    TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+    DEFERRED_CLEANUP_DELAY_SECONDS = 5.0  # Idle time before gc + device cache release
 
     def __init__(self):
         self.tasks: OrderedDict[str, PlanningTask] = OrderedDict()  # LRU ordering
         self.trajectory_tasks: OrderedDict[str, TrajectoryTask] = OrderedDict()  # Trajectory tasks
         self._running_tasks: Dict[str, asyncio.Task] = {}
+        # Cleanup indexes for self.tasks: min-heap of (start_time, task_id) for TTL
+        # eviction and terminal tasks in completion order for over-limit trimming
+        self._ttl_heap: list[tuple[float, str]] = []
+        self._completion_order: deque[str] = deque()
         self._vjepa_inference = None
+        self._loader = None
         self._model_loaded = False
+        # model_id -> (model_size_gb, has_checkpoint, is_cached), avoids stat calls per task
+        self._model_meta: Dict[str, Tuple[float, bool, bool]] = {}
+        self._deferred_cleanup_handle: Optional[asyncio.TimerHandle] = None
+        # All model calls go through one worker so concurrent tasks don't oversubscribe
+        # PyTorch's intra-op thread pool (the default executor has up to 32 threads)
+        self._inference_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="vjepa-infer",
+            initializer=_init_inference_thread,
+        )
+
+    def _get_loader(self):
+        """Lazy fetch of the V-JEPA2 model loader singleton."""
+        if self._loader is None:
+            from app.services.vjepa2 import get_model_loader
+            self._loader = get_model_loader()
+        return self._loader
 
     def _get_inference(self, model_id: str = None):
         """Lazy load V-JEPA2 inference service."""
         if self._vjepa_inference is None:
-            from app.services.vjepa2 import get_inference, get_model_loader
+            from app.services.vjepa2 import get_inference
             self._vjepa_inference = get_inference()
 
         # Load model (or switch to requested model)
-        from app.services.vjepa2 import get_model_loader
-        loader = get_model_loader()
+        loader = self._get_loader()
         target_model = model_id or settings.default_model
 
         if not loader.is_loaded(target_model):
             loader.load_model(target_model)
             self._model_loaded = True
+            # Loading downloads weights and writes a checkpoint, so cached metadata is stale
+            self._model_meta.pop(target_model, None)
 
         return self._vjepa_inference
 
+    async def _get_model_meta(self, loader, model_id: str) -> Tuple[float, bool, bool]:
+        """
+        Get (model_size_gb, has_checkpoint, is_cached) for a model.
+
+        Results are memoized per model; on a miss the filesystem checks run in
+        the thread executor so they don't stall the event loop.
+        """
+        meta = self._model_meta.get(model_id)
+        if meta is None:
+            meta = await asyncio.get_running_loop().run_in_executor(
+                None,
+                lambda: (
+                    loader.get_model_size_gb(model_id),
+                    loader.has_checkpoint(model_id),
+                    loader.is_cached(model_id),
+                )
+            )
+            self._model_meta[model_id] = meta
+        return meta
+
+    def _schedule_deferred_cleanup(self) -> None:
+        """Schedule gc + device cache release; re-arms the timer if already pending."""
+        if self._deferred_cleanup_handle is not None:
+            self._deferred_cleanup_handle.cancel()
+        self._deferred_cleanup_handle = asyncio.get_running_loop().call_later(
+            self.DEFERRED_CLEANUP_DELAY_SECONDS, self._deferred_cleanup
+        )
+
+    def _deferred_cleanup(self) -> None:
+        """Release memory once no planning or trajectory task is running."""
+        self._deferred_cleanup_handle = None
+
+        if any(t.status == "running" for t in self.tasks.values()) or any(
+            t.status == "running" for t in self.trajectory_tasks.values()
+        ):
+            return  # The running task schedules another cleanup when it finishes
+
+        # Run on the inference thread so the release is serialized with model work
+        self._inference_executor.submit(self._release_device_memory)
+
+    def _release_device_memory(self) -> None:
+        """Collect garbage and release cached device memory (inference thread)."""
+        import gc
+        import torch
+
+        gc.collect()
+
+        # Empty GPU cache
+        if self._vjepa_inference is not None:
+            if self._vjepa_inference.device.type == "mps":
+                torch.mps.synchronize()
+                torch.mps.empty_cache()
+            elif self._vjepa_inference.device.type == "cuda":
+                torch.cuda.empty_cache()
+
+        logger.info("Memory cleanup completed")
+
+    @staticmethod
+    def _schedule_progress(progress_callback: Callable, progress) -> None:
+        """
+        Start a progress callback coroutine on the event loop thread.
+
+        Passed to call_soon_threadsafe together with its arguments, so sending an
+        update doesn't allocate a fresh lambda per call.
+        """
+        asyncio.get_running_loop().create_task(progress_callback(progress))
+
+    def _set_terminal_status(self, task: PlanningTask, status: str) -> None:
+        """Move a planning task to a terminal status and index it for cleanup."""
+        if task.status not in self.TERMINAL_STATUSES:
+            self._completion_order.append(task.id)
+        task.status = status
+
     def _cleanup_old_tasks(self):
         """Remove old completed tasks to prevent memory leaks."""
-        current_time = time.time()
+        current_time = time.monotonic()
+
+        # Remove tasks older than TTL (heap is ordered by start time)
+        still_running = []
+        while self._ttl_heap and (current_time - self._ttl_heap[0][0]) > self.TASK_TTL_SECONDS:
+            entry = heapq.heappop(self._ttl_heap)
+            task = self.tasks.get(entry[1])
+            if task is None:
+                continue  # Already trimmed over limit
+            if task.status in self.TERMINAL_STATUSES:
+                del self.tasks[entry[1]]
+                logger.debug(f"Cleaned up old task {entry[1]}")
+            else:
+                still_running.append(entry)  # Re-check once it finishes
 
-        # Remove tasks older than TTL
-        tasks_to_remove = []
-        for task_id, task in list(self.tasks.items()):
-            if task.status in ("completed", "failed", "cancelled"):
-                if task.start_time and (current_time - task.start_time) > self.TASK_TTL_SECONDS:
-                    tasks_to_remove.append(task_id)
+        for entry in still_running:
+            heapq.heappush(self._ttl_heap, entry)
 
-        for task_id in tasks_to_remove:
-            del self.tasks[task_id]
-            logger.debug(f"Cleaned up old task {task_id}")
+        # Drop completion entries whose tasks were already evicted by TTL
+        while self._completion_order and self._completion_order[0] not in self.tasks:
+            self._completion_order.popleft()
 
         # If still over limit, remove oldest completed tasks
-        if len(self.tasks) > self.MAX_TASKS:
-            completed_tasks = [
-                (tid, t) for tid, t in self.tasks.items()
-                if t.status in ("completed", "failed", "cancelled")
-            ]
-            # Sort by start_time (oldest first)
-            completed_tasks.sort(key=lambda x: x[1].start_time or 0)
-
-            to_remove = len(self.tasks) - self.MAX_TASKS
-            for task_id, _ in completed_tasks[:to_remove]:
+        while len(self.tasks) > self.MAX_TASKS and self._completion_order:
+            task_id = self._completion_order.popleft()
+            if task_id in self.tasks:
                 del self.tasks[task_id]
                 logger.debug(f"Cleaned up task {task_id} (over limit)")
 
@@ -138,7 +416,7 @@ class PlannerService:
         task = self.tasks.get(task_id)
         if task and task.status == "running":
             task.cancelled = True
-            task.status = "cancelled"
+            self._set_terminal_status(task, "cancelled")
             return True
         return False
 
@@ -157,15 +435,14 @@ class PlannerService:
 
         # Check if it's an upload_id
         if image_ref in _uploads:
-            upload = _uploads[image_ref]
-            return Image.open(io.BytesIO(upload["content"]))
+            return _decode_upload_image(image_ref)
 
         # Try base64 decode
         if image_ref.startswith("data:image"):
             import base64
             # Remove data URL prefix
             _, data = image_ref.split(",", 1)
-            image_bytes = base64.b64decode(data)
+            image_bytes = base64.b64decode(data, validate=False)
             return Image.open(io.BytesIO(image_bytes))
 
         logger.warning(f"Could not load image from reference: {image_ref[:50]}...")
@@ -189,7 +466,8 @@ class PlannerService:
             raise ValueError(f"Task {task_id} not found")
 
         task.status = "running"
-        task.start_time = time.time()
+        task.start_time = time.monotonic()
+        heapq.heappush(self._ttl_heap, (task.start_time, task_id))
 
         iterations = task.request.iterations
         samples = task.request.samples
@@ -202,14 +480,11 @@ class PlannerService:
         main_loop = asyncio.get_running_loop()
 
         # Check if model needs to be loaded and send status
-        from app.services.vjepa2 import get_model_loader
-        loader = get_model_loader()
+        loader = self._get_loader()
 
         if not loader.is_loaded(model_id):
             # Get model size for progress display
-            model_size_gb = loader.get_model_size_gb(model_id)
-            has_checkpoint = loader.has_checkpoint(model_id)
-            is_cached = loader.is_cached(model_id)
+            model_size_gb, has_checkpoint, is_cached = await self._get_model_meta(loader, model_id)
 
             # Determine loading strategy and status message
             # Priority: checkpoint (fastest) > PyTorch Hub cache > download
@@ -272,33 +547,35 @@ class PlannerService:
 
             if progress_callback:
                 # Send loading status to WebSocket
-                main_loop.call_soon_threadsafe(
-                    lambda p=loading_progress: main_loop.create_task(progress_callback(p))
-                )
+                main_loop.call_soon_threadsafe(self._schedule_progress, progress_callback, loading_progress)
                 # Give WebSocket time to send the message
                 await asyncio.sleep(0.1)
 
             # If model is not cached AND no checkpoint, start a background task to poll download progress
             if not is_cached and not has_checkpoint:
-                download_start_time = time.time()
+                download_start_time = time.monotonic()
 
                 async def poll_download_progress():
-                    """Poll download progress with adaptive intervals (20-50% less CPU usage)."""
-                    from app.services.vjepa2 import get_download_progress
+                    """Stream download progress as the hub downloader publishes it."""
+                    from app.services.vjepa2 import subscribe_download_progress, unsubscribe_download_progress
                     last_downloaded_bytes = 0
                     last_time = download_start_time
-                    poll_interval = 0.2  # Start fast for responsiveness
+                    min_interval = 0.2  # Start fast for responsiveness
+
+                    subscription = subscribe_download_progress(model_id)
+                    try:
+                        # Wakes only when the downloader publishes new progress
+                        async for progress_info in subscription:
+                            if task.status != "running":
+                                break
 
-                    while task.status == "running":
-                        progress_info = get_download_progress(model_id)
-                        if progress_info:
                             downloaded_bytes = progress_info.get("downloaded", 0)
                             total_bytes = progress_info.get("total", 1)
                             downloaded_gb = downloaded_bytes / (1024 ** 3)
                             total_gb = total_bytes / (1024 ** 3)
 
                             # Calculate speed
-                            current_time = time.time()
+                            current_time = time.monotonic()
                             time_delta = current_time - last_time
                             if time_delta > 0.5:  # Update speed every 0.5s
                                 bytes_delta = downloaded_bytes - last_downloaded_bytes
@@ -331,24 +608,24 @@ class PlannerService:
                                 task.progress = update
 
                                 if progress_callback:
-                                    main_loop.call_soon_threadsafe(
-                                        lambda p=update: main_loop.create_task(progress_callback(p))
-                                    )
+                                    main_loop.call_soon_threadsafe(self._schedule_progress, progress_callback, update)
 
-                                # Adaptive polling: slow down as download progresses (20-50% less CPU)
+                                # Throttle updates as download progresses; progress published
+                                # meanwhile is coalesced into the next wakeup
                                 download_progress = downloaded_bytes / total_bytes if total_bytes > 0 else 0
                                 if download_progress < 0.1:
-                                    poll_interval = 0.2  # Fast updates at start
+                                    min_interval = 0.2  # Fast updates at start
                                 elif download_progress < 0.5:
-                                    poll_interval = 0.5  # Medium updates in middle
+                                    min_interval = 0.5  # Medium updates in middle
                                 else:
-                                    poll_interval = 1.0  # Slower updates near end
-
-                        await asyncio.sleep(poll_interval)
+                                    min_interval = 1.0  # Slower updates near end
+                                await asyncio.sleep(min_interval)
 
-                        # Check if download is complete
-                        if progress_info and progress_info.get("downloaded", 0) >= progress_info.get("total", 1):
-                            break
+                            # Check if download is complete
+                            if downloaded_bytes >= total_bytes:
+                                break
+                    finally:
+                        unsubscribe_download_progress(subscription)
 
                 # Start polling in background (will be cancelled when model load completes)
                 poll_task = asyncio.create_task(poll_download_progress())
@@ -363,7 +640,7 @@ class PlannerService:
         goal_img = self._load_image_from_upload(task.request.goal_image)
 
         if current_img is None or goal_img is None:
-            task.status = "failed"
+            self._set_terminal_status(task, "failed")
             error_msg = f"Could not load images. Current image: {'loaded' if current_img else 'FAILED'}, Goal image: {'loaded' if goal_img else 'FAILED'}. Make sure images are uploaded to the backend first."
             task.error = error_msg
             logger.error(error_msg)
@@ -373,7 +650,7 @@ class PlannerService:
         # Run in thread executor so it doesn't block the async event loop
         # This allows the download progress polling to actually run
         inference = await main_loop.run_in_executor(
-            None,
+            self._inference_executor,
             lambda: self._get_inference(model_id)
         )
 
@@ -385,7 +662,7 @@ class PlannerService:
             except asyncio.CancelledError:
                 pass
         if inference is None:
-            task.status = "failed"
+            self._set_terminal_status(task, "failed")
             task.error = "V-JEPA2 model not available"
             raise RuntimeError(task.error)
 
@@ -432,14 +709,13 @@ class PlannerService:
         task.progress = encoding_progress
 
         if progress_callback:
-            main_loop.call_soon_threadsafe(
-                lambda p=encoding_progress: main_loop.create_task(progress_callback(p))
-            )
+            main_loop.call_soon_threadsafe(self._schedule_progress, progress_callback, encoding_progress)
             # Give WebSocket time to send the message
             await asyncio.sleep(0.05)
 
         # Track energy history for progress updates
         energy_history = []
+        progress_coalescer = _ProgressCoalescer(main_loop, progress_callback) if progress_callback else None
 
         # Progress callback wrapper for CEM (runs in thread pool)
         def cem_progress(iteration: int, total: int, best_energy: float, best_action):
@@ -451,7 +727,7 @@ class PlannerService:
             energy_history.append(round(best_energy, 3))
 
             # Calculate elapsed and ETA
-            elapsed = time.time() - task.start_time
+            elapsed = time.monotonic() - task.start_time
             avg_time_per_iter = elapsed / iteration if iteration > 0 else 0
             eta = avg_time_per_iter * (total - iteration)
 
@@ -461,7 +737,7 @@ class PlannerService:
                 iteration=iteration,
                 total_iterations=total,
                 best_energy=round(best_energy, 3),
-                energy_history=energy_history.copy(),  # Include accumulated energy history
+                energy_history=energy_history,  # Pydantic copies the list on validation
                 samples_evaluated=iteration * samples,
                 elapsed_seconds=round(elapsed, 1),
                 eta_seconds=round(eta, 1),
@@ -469,17 +745,14 @@ class PlannerService:
 
             task.progress = progress
 
-            # Send progress callback using thread-safe scheduling
-            if progress_callback:
-                # Use call_soon_threadsafe to schedule the coroutine from thread pool
-                main_loop.call_soon_threadsafe(
-                    lambda p=progress: main_loop.create_task(progress_callback(p))
-                )
+            # Send progress callback (coalesced and rate-limited, thread-safe)
+            if progress_coalescer:
+                progress_coalescer.submit(progress)
 
         # Run CEM optimization (in thread pool to avoid blocking)
         try:
             cem_result = await main_loop.run_in_executor(
-                None,
+                self._inference_executor,
                 lambda: inference.run_cem(
                     current_image=current_img,
                     goal_image=goal_img,
@@ -490,22 +763,22 @@ class PlannerService:
                 )
             )
         except asyncio.CancelledError:
-            task.status = "cancelled"
+            self._set_terminal_status(task, "cancelled")
             raise
         except Exception as e:
-            task.status = "failed"
+            self._set_terminal_status(task, "failed")
             error_msg = f"Planning execution failed: {str(e)}"
             task.error = error_msg
             logger.error(error_msg, exc_info=True)
             raise RuntimeError(error_msg) from e
 
+        # Make sure the final iteration's update goes out before completion is broadcast
+        if progress_coalescer:
+            await progress_coalescer.drain()
+
         # Clear tensor cache after planning (aggressive mode for multi-step planning)
         inference.clear_cache(aggressive=True)
 
-        # Explicitly delete PIL Image objects to free memory
-        del current_img
-        del goal_img
-
         # Create final result
         result = ActionResult(
             action=cem_result["action"],
@@ -520,7 +793,7 @@ class PlannerService:
         )
 
         task.result = result
-        task.status = "completed"
+        self._set_terminal_status(task, "completed")
 
         logger.info(
             f"Planning completed: action={result.action}, "
@@ -528,20 +801,9 @@ class PlannerService:
             f"samples={cem_result.get('samples_evaluated', 'N/A')}"
         )
 
-        # Aggressive memory cleanup after task completion
-        import gc
-        import torch
-
-        gc.collect()
-
-        # Empty GPU cache
-        if inference.device.type == "mps":
-            torch.mps.synchronize()
-            torch.mps.empty_cache()
-        elif inference.device.type == "cuda":
-            torch.cuda.empty_cache()
-
-        logger.info("Memory cleanup completed")
+        # Full GC + device cache release is deferred until the planner is idle so
+        # back-to-back requests keep a warm allocator
+        self._schedule_deferred_cleanup()
 
         # Trigger cleanup after task completion
         self._cleanup_old_tasks()
@@ -602,7 +864,7 @@ class PlannerService:
             raise ValueError(f"Trajectory task {task_id} not found")
 
         task.status = "running"
-        task.start_time = time.time()
+        task.start_time = time.monotonic()
 
         num_steps = task.request.num_steps
         iterations = task.request.iterations
@@ -612,13 +874,10 @@ class PlannerService:
         main_loop = asyncio.get_running_loop()
 
         # Load model if needed (similar to regular planning)
-        from app.services.vjepa2 import get_model_loader
-        loader = get_model_loader()
+        loader = self._get_loader()
 
         if not loader.is_loaded(model_id):
-            model_size_gb = loader.get_model_size_gb(model_id)
-            has_checkpoint = loader.has_checkpoint(model_id)
-            is_cached = loader.is_cached(model_id)
+            model_size_gb, has_checkpoint, is_cached = await self._get_model_meta(loader, model_id)
 
             loading_progress = TrajectoryProgress(
                 status="loading_model",
@@ -639,9 +898,7 @@ class PlannerService:
             task.progress = loading_progress
 
             if progress_callback:
-                main_loop.call_soon_threadsafe(
-                    lambda p=loading_progress: main_loop.create_task(progress_callback(p))
-                )
+                main_loop.call_soon_threadsafe(self._schedule_progress, progress_callback, loading_progress)
                 await asyncio.sleep(0.1)
 
         # Load images
@@ -656,7 +913,7 @@ class PlannerService:
 
         # Get inference service
         inference = await main_loop.run_in_executor(
-            None, lambda: self._get_inference(model_id)
+            self._inference_executor, lambda: self._get_inference(model_id)
         )
 
         if inference is None:
@@ -680,15 +937,13 @@ class PlannerService:
         task.progress = encoding_progress
 
         if progress_callback:
-            main_loop.call_soon_threadsafe(
-                lambda p=encoding_progress: main_loop.create_task(progress_callback(p))
-            )
+            main_loop.call_soon_threadsafe(self._schedule_progress, progress_callback, encoding_progress)
             await asyncio.sleep(0.05)
 
         # =======================================================================
         # EMBEDDING-SPACE ROLLOUT: Encode images ONCE, track embeddings
         # =======================================================================
-        import torch
+        from app.services.vjepa2 import embedding_l1_distance
 
         # Step 0: Encode both images and get initial embeddings
         logger.info("[Trajectory] Encoding images and computing initial distance...")
@@ -711,21 +966,26 @@ class PlannerService:
             logger.info(f"[Trajectory] DEBUG: current_emb ptr={current_emb.data_ptr()}, goal_emb ptr={goal_emb.data_ptr()}")
             logger.info(f"[Trajectory] DEBUG: current_emb mean={current_emb.mean().item():.6f}, goal_emb mean={goal_emb.mean().item():.6f}")
 
-            # Clone to new tensors (deep copy to ensure independence)
-            current_emb = current_emb.clone().detach().contiguous()
-            goal_emb = goal_emb.clone().detach().contiguous()
-
-            logger.info(f"[Trajectory] DEBUG: After clone - current ptr={current_emb.data_ptr()}, goal ptr={goal_emb.data_ptr()}")
+            # Cached patch embeddings are fresh encoder outputs that are never mutated
+            # in place, so a detached view is enough (skips a device-side memcpy)
+            current_emb = current_emb.detach()
+            if not current_emb.is_contiguous():
+                current_emb = current_emb.contiguous()
+            # The goal is fixed for the whole trajectory: make sure it lives on the
+            # inference device once (no-op when already there) and share that tensor
+            goal_emb = goal_emb.detach().to(inference.device, non_blocking=True)
+            if not goal_emb.is_contiguous():
+                goal_emb = goal_emb.contiguous()
 
             # Compute initial distance (L1 mean, same as energy calculation)
-            initial_dist = torch.abs(current_emb - goal_emb).mean().item()
+            initial_dist = embedding_l1_distance(current_emb, goal_emb).item()
             logger.info(f"[Trajectory] DEBUG: Computed initial_dist={initial_dist:.6f}")
 
             return current_emb, goal_emb, initial_dist
 
         try:
             current_embedding, goal_embedding, initial_distance = await main_loop.run_in_executor(
-                None, encode_and_get_distance
+                self._inference_executor, encode_and_get_distance
             )
             logger.info(f"[Trajectory] Initial embedding distance: {initial_distance:.4f}")
         except Exception as e:
@@ -736,9 +996,64 @@ class PlannerService:
 
         # Track trajectory state in embedding space
         trajectory_embedding = current_embedding  # Will be rolled forward each step
+        current_distance = initial_distance  # Distance of trajectory_embedding to the goal
+
+        def run_step_sync(curr_emb, curr_distance: float, step_progress_callback) -> dict:
+            """
+            Run one trajectory step entirely on the executor thread.
+
+            CEM, the embedding rollout and the distance-to-goal computation run
+            back to back without returning to the event loop, so each step costs
+            one executor round-trip instead of three. The on-device goal embedding
+            is shared by reference across all steps.
+            """
+            cem_result = inference.run_cem_from_embedding(
+                current_embedding=curr_emb,
+                goal_embedding=goal_embedding,
+                initial_distance=initial_distance,
+                num_samples=samples,
+                num_iterations=iterations,
+                progress_callback=step_progress_callback,
+            )
+
+            # Roll forward embedding using the action found by CEM
+            # This predicts what embedding we would reach AFTER taking this action
+            try:
+                next_emb = inference.predict_next_embedding(
+                    current_embedding=curr_emb,
+                    action=cem_result["action"],
+                )
+            except Exception as e:
+                logger.warning(f"[Trajectory] Failed to predict next embedding: {e}")
+                # Continue with current embedding - trajectory will be less accurate
+                # but still valid (graceful degradation). Nothing to allocate or
+                # recompute: the embedding and its distance are unchanged.
+                return {
+                    "cem_result": cem_result,
+                    "next_embedding": curr_emb,
+                    "distance": curr_distance,
+                    "rolled_forward": False,
+                }
+
+            # Now compute distance to goal AFTER rolling forward
+            # This shows how close we got after taking this action
+            # Scripted l1_loss reduces in one kernel instead of materializing (a-b) and abs(a-b)
+            distance = embedding_l1_distance(next_emb, goal_embedding).item()
+
+            return {
+                "cem_result": cem_result,
+                "next_embedding": next_emb,
+                "distance": distance,
+                "rolled_forward": True,
+            }
 
         # Sequential trajectory planning with embedding rollout
-        completed_steps: list[TrajectoryStep] = []
+        completed_steps: list[TrajectoryStep] = task.completed_steps
+        # Parallel per-step accumulators for the final statistics pass
+        step_energies: list[float] = []
+        step_confidences: list[float] = []
+        progress_coalescer = _ProgressCoalescer(main_loop, progress_callback) if progress_callback else None
+        step_reporter = _StepProgressReporter(task, num_steps, samples, progress_coalescer)
 
         for step_idx in range(num_steps):
             if task.cancelled:
@@ -746,67 +1061,20 @@ class PlannerService:
 
             logger.info(f"[Trajectory] Step {step_idx + 1}/{num_steps}")
 
-            # Track energy history for this step
-            step_energy_history = []
-
-            # CEM progress callback for this step
-            def cem_progress_for_step(iteration: int, total: int, best_energy: float, best_action, step=step_idx):
-                nonlocal step_energy_history
-
-                if task.cancelled:
-                    raise asyncio.CancelledError("Task cancelled by user")
-
-                step_energy_history.append(round(best_energy, 3))
-
-                elapsed = time.time() - task.start_time
-                # Estimate total time: (elapsed / (completed_steps + current_progress)) * total_steps
-                steps_done = step + (iteration / total if total > 0 else 0)
-                if steps_done > 0:
-                    eta = (elapsed / steps_done) * (num_steps - steps_done)
-                else:
-                    eta = 0
-
-                progress = TrajectoryProgress(
-                    status="running",
-                    current_step=step,
-                    total_steps=num_steps,
-                    iteration=iteration,
-                    total_iterations=total,
-                    best_energy=round(best_energy, 3),
-                    energy_history=step_energy_history.copy(),
-                    samples_evaluated=iteration * samples,
-                    elapsed_seconds=round(elapsed, 1),
-                    eta_seconds=round(eta, 1),
-                    completed_steps=completed_steps.copy(),
-                )
-
-                task.progress = progress
-
-                if progress_callback:
-                    main_loop.call_soon_threadsafe(
-                        lambda p=progress: main_loop.create_task(progress_callback(p))
-                    )
+            # Reset the shared reporter for this step
+            step_reporter.step = step_idx
+            step_reporter.history.clear()
 
-            # Run CEM for this step
+            # Run CEM, roll forward and measure distance in a single executor task
             # IMPORTANT: Use run_cem_from_embedding for ALL steps to avoid
             # run_cem's finally block clearing the cache and invalidating our embeddings
             try:
-                # Capture current values by binding to local variables (avoid closure capture issues)
-                current_emb_for_cem = trajectory_embedding.clone().detach()
-                goal_emb_for_cem = goal_embedding.clone().detach()
-                init_dist_for_cem = initial_distance
-
-                cem_result = await main_loop.run_in_executor(
-                    None,
-                    lambda curr=current_emb_for_cem, goal=goal_emb_for_cem, dist=init_dist_for_cem:
-                        inference.run_cem_from_embedding(
-                            current_embedding=curr,
-                            goal_embedding=goal,
-                            initial_distance=dist,
-                            num_samples=samples,
-                            num_iterations=iterations,
-                            progress_callback=cem_progress_for_step,
-                        )
+                # Bind by default-arg: trajectory_embedding is only reassigned after the
+                # await returns and nothing mutates it in flight, so no clone is needed
+                step_output = await main_loop.run_in_executor(
+                    self._inference_executor,
+                    lambda curr=trajectory_embedding, dist=current_distance:
+                        run_step_sync(curr, dist, step_reporter)
                 )
             except asyncio.CancelledError:
                 task.status = "cancelled"
@@ -817,44 +1085,12 @@ class PlannerService:
                 logger.error(task.error, exc_info=True)
                 raise RuntimeError(task.error) from e
 
-            # Roll forward embedding using the action found by CEM
-            # This predicts what embedding we would reach AFTER taking this action
-            try:
-                # Capture current values to avoid closure issues
-                emb_to_roll = trajectory_embedding.clone().detach()
-                action_to_apply = cem_result["action"]
-
-                def predict_next(emb, action):
-                    return inference.predict_next_embedding(
-                        current_embedding=emb,
-                        action=action,
-                    )
-
-                # Roll forward to get predicted next embedding
-                trajectory_embedding = await main_loop.run_in_executor(
-                    None,
-                    lambda e=emb_to_roll, a=action_to_apply: predict_next(e, a)
-                )
+            cem_result = step_output["cem_result"]
+            trajectory_embedding = step_output["next_embedding"]
+            current_distance = step_output["distance"]
+            if step_output["rolled_forward"]:
                 logger.info(f"[Trajectory] Rolled forward embedding for step {step_idx + 1}")
 
-            except Exception as e:
-                logger.warning(f"[Trajectory] Failed to predict next embedding: {e}")
-                # Continue with current embedding - trajectory will be less accurate
-                # but still valid (graceful degradation)
-
-            # Now compute distance to goal AFTER rolling forward
-            # This shows how close we got after taking this action
-            def compute_distance(curr_emb, goal_emb):
-                return torch.abs(curr_emb - goal_emb).mean().item()
-
-            # Capture embeddings for lambda
-            curr_emb_for_dist = trajectory_embedding.clone().detach()
-            goal_emb_for_dist = goal_embedding.clone().detach()
-
-            current_distance = await main_loop.run_in_executor(
-                None, lambda c=curr_emb_for_dist, g=goal_emb_for_dist: compute_distance(c, g)
-            )
-
             # Calculate progress ratio (0 = no progress, 1 = reached goal)
             if initial_distance > 0.01:
                 progress_ratio = max(0.0, 1.0 - (current_distance / initial_distance))
@@ -872,6 +1108,8 @@ class PlannerService:
                 progress_ratio=round(progress_ratio, 4),
             )
             completed_steps.append(step_result)
+            step_energies.append(step_result.energy)
+            step_confidences.append(step_result.confidence)
 
             logger.info(
                 f"[Trajectory] Step {step_idx + 1} complete: "
@@ -879,38 +1117,48 @@ class PlannerService:
                 f"distance={current_distance:.4f}, progress={progress_ratio*100:.1f}%"
             )
 
-            # Clear cache between steps to prevent memory buildup
-            inference.clear_cache(aggressive=False)
+            # Push the finished step as a delta; clients keep the running list.
+            # Sent directly (after draining) so coalescing can never drop it. The
+            # delta is not stored on task.progress, so reconnect snapshots never
+            # replay it.
+            if progress_coalescer and task.progress is not None:
+                await progress_coalescer.drain()
+                step_progress = task.progress.model_copy(update={"new_completed_step": step_result})
+                main_loop.create_task(progress_callback(step_progress))
 
-        # Compute final distance after all steps
-        # Capture embeddings to avoid closure issues
-        final_traj_emb = trajectory_embedding.clone().detach()
-        final_goal_emb = goal_embedding.clone().detach()
-        final_distance = await main_loop.run_in_executor(
-            None, lambda t=final_traj_emb, g=final_goal_emb: torch.abs(t - g).mean().item()
-        )
+            # No per-step clear_cache: step embeddings are only kilobytes, and flushing
+            # the allocator here makes every following CEM step re-allocate from scratch.
+            # The single aggressive clear after the loop releases everything.
+
+        # Final distance is the last step's post-rollout distance - trajectory_embedding
+        # has not changed since, so there is no need for another reduction and sync
+        final_distance = current_distance if completed_steps else initial_distance
+
+        if progress_coalescer:
+            await progress_coalescer.drain()
 
         # Final cleanup
         inference.clear_cache(aggressive=True)
-        del current_img
-        del goal_img
 
         # Compute trajectory statistics
-        total_energy = sum(s.energy for s in completed_steps)
-        avg_energy = total_energy / len(completed_steps) if completed_steps else 0
-        avg_confidence = sum(s.confidence for s in completed_steps) / len(completed_steps) if completed_steps else 0
+        total_energy = math.fsum(step_energies)
+        avg_energy = total_energy / len(step_energies) if step_energies else 0
+        avg_confidence = statistics.fmean(step_confidences) if step_confidences else 0
 
-        # Calculate total progress and energy trend
-        total_progress = 1.0 - (final_distance / initial_distance) if initial_distance > 0.01 else 1.0
+        # Calculate total progress and energy trend from a single distance ratio
+        distance_ratio = final_distance / max(initial_distance, 1e-9)
+        total_progress = 1.0 - distance_ratio if initial_distance > 0.01 else 1.0
 
         # Determine energy trend based on overall progress
         # If we're making progress toward the goal (distance decreasing), that's what matters
         if len(completed_steps) >= 2:
             # Compare initial distance to final distance for trend
             # This reflects whether we're actually approaching the goal
-            if final_distance < initial_distance * 0.95:  # Made at least 5% progress
+            if initial_distance <= 1e-9:  # Ratio is meaningless from the goal itself
+                energy_trend = "increasing" if final_distance > initial_distance else "stable"
+            elif distance_ratio < 0.95:  # Made at least 5% progress
                 energy_trend = "decreasing"
-            elif final_distance > initial_distance * 1.05:  # Got further away
+            elif distance_ratio > 1.05:  # Got further away
                 energy_trend = "increasing"
             else:
                 energy_trend = "stable"  # Within 5% of initial
@@ -939,15 +1187,8 @@ class PlannerService:
             f"energy_trend={energy_trend}"
         )
 
-        # Memory cleanup
-        import gc
-
-        gc.collect()
-        if inference.device.type == "mps":
-            torch.mps.synchronize()
-            torch.mps.empty_cache()
-        elif inference.device.type == "cuda":
-            torch.cuda.empty_cache()
+        # Memory cleanup (deferred until idle)
+        self._schedule_deferred_cleanup()
 
         self._cleanup_old_tasks()
 
@@ -994,11 +1235,10 @@ class PlannerService:
         import time
 
         main_loop = asyncio.get_running_loop()
-        start_time = time.time()
+        start_time = time.monotonic()
 
         # Load model if needed
-        from app.services.vjepa2 import get_model_loader
-        loader = get_model_loader()
+        loader = self._get_loader()
 
         if not loader.is_loaded(model_id):
             # Load the model (blocking)
@@ -1016,7 +1256,7 @@ class PlannerService:
 
         # Get inference service
         inference = await main_loop.run_in_executor(
-            None, lambda: self._get_inference(model_id)
+            self._inference_executor, lambda: self._get_inference(model_id)
         )
 
         if inference is None:
@@ -1040,7 +1280,7 @@ class PlannerService:
         logger.info(f"[SingleStep] Step {step_index}: Running CEM with {samples} samples, {iterations} iterations...")
         try:
             cem_result = await main_loop.run_in_executor(
-                None,
+                self._inference_executor,
                 lambda: inference.run_cem(
                     current_image=current_img,
                     goal_image=goal_img,
@@ -1056,8 +1296,6 @@ class PlannerService:
 
         # Cleanup
         inference.clear_cache(aggressive=True)
-        del current_img
-        del goal_img
         gc.collect()
 
         if inference.device.type == "mps":
@@ -1066,7 +1304,7 @@ class PlannerService:
         elif inference.device.type == "cuda":
             torch.cuda.empty_cache()
 
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
         logger.info(
             f"[SingleStep] Step {step_index} completed in {elapsed:.1f}s: "
             f"action={cem_result['action']}, energy={cem_result['energy']:.3f}"
@@ -1,8 +1,11 @@
 """RoboSuite simulator wrapper for V-JEPA2 action testing."""
 
+import io
+import json
 import logging
-import pickle
-import hashlib
+import math
+import os
+import sys
 from typing import Dict, Any, List, Optional
 
 import numpy as np
@@ -10,6 +13,97 @@ from PIL import Image
 
 logger = logging.getLogger(__name__)
 
+# MuJoCo picks its GL backend from MUJOCO_GL when it is first imported. On headless
+# Linux hosts it otherwise may fall back to OSMesa software rendering, which is far
+# slower than EGL for every offscreen frame. Deployers can still override it.
+# macOS has no EGL, so it keeps MuJoCo's default (CGL/GLFW).
+if sys.platform.startswith("linux"):
+    os.environ.setdefault("MUJOCO_GL", "egl")
+
+# Optional dependency: resolved once at import so initialize() doesn't re-enter the
+# import machinery on every reset. This module is itself imported lazily by the API.
+try:
+    import robosuite as _suite
+except ImportError as _suite_import_error:
+    _suite = None
+    logger.warning(f"robosuite not available: {_suite_import_error}")
+else:
+    logger.info(f"robosuite loaded, MUJOCO_GL={os.environ.get('MUJOCO_GL', '<default>')}")
+
+# Optional dependency: numba compiles the per-step action kernels below. Without it
+# the same functions run as plain Python.
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
+
+def _euler_xyz_to_rotvec(roll, pitch, yaw):
+    """
+    Closed-form equivalent of scipy's Rotation.from_euler('xyz', ...).as_rotvec().
+
+    Lowercase 'xyz' is extrinsic (R = Rz(yaw) @ Ry(pitch) @ Rx(roll)). Going through
+    the quaternion keeps the result stable near both 0 and pi, unlike acos(trace).
+    """
+    cr = math.cos(roll * 0.5)
+    sr = math.sin(roll * 0.5)
+    cp = math.cos(pitch * 0.5)
+    sp = math.sin(pitch * 0.5)
+    cy = math.cos(yaw * 0.5)
+    sy = math.sin(yaw * 0.5)
+
+    # q = qz * qy * qx (Hamilton product)
+    qw = cy * cp * cr + sy * sp * sr
+    qx = cy * cp * sr - sy * sp * cr
+    qy = cy * sp * cr + sy * cp * sr
+    qz = sy * cp * cr - cy * sp * sr
+
+    # Use the w >= 0 hemisphere so the angle lands in [0, pi]
+    if qw < 0.0:
+        qw = -qw
+        qx = -qx
+        qy = -qy
+        qz = -qz
+
+    norm = math.sqrt(qx * qx + qy * qy + qz * qz)
+    angle = 2.0 * math.atan2(norm, qw)
+    if angle <= 1e-3:
+        # Taylor expansion of angle / sin(angle / 2), same as scipy
+        angle2 = angle * angle
+        scale = 2.0 + angle2 / 12.0 + 7.0 * angle2 * angle2 / 2880.0
+    else:
+        scale = angle / math.sin(angle * 0.5)
+    return scale * qx, scale * qy, scale * qz
+
+
+def _transform_action_kernel(action, out):
+    """Write the RoboSuite OSC_POSE form of a DROID action into out in one pass."""
+    # Position deltas pass through unscaled
+    out[0] = action[0]
+    out[1] = action[1]
+    out[2] = action[2]
+    # Euler (roll, pitch, yaw) -> axis-angle
+    ax, ay, az = _euler_xyz_to_rotvec(action[3], action[4], action[5])
+    out[3] = ax
+    out[4] = ay
+    out[5] = az
+    # Gripper clamped to [-1, 1] (NaN maps to -1)
+    gripper = action[6]
+    out[6] = gripper if -1.0 <= gripper <= 1.0 else (1.0 if gripper > 0.0 else -1.0)
+    return out
+
+
+if _njit is not None:
+    # Explicit signatures compile eagerly at import instead of on the first action, and
+    # cache=True persists the machine code so later processes skip compilation entirely.
+    # The kernel reads the float64 input action and writes the float32 action buffers.
+    _euler_xyz_to_rotvec = _njit("UniTuple(float64, 3)(float64, float64, float64)", cache=True)(
+        _euler_xyz_to_rotvec
+    )
+    _transform_action_kernel = _njit("float32[:](float64[:], float32[:])", cache=True)(
+        _transform_action_kernel
+    )
+
 
 def _compute_array_stats(arr: np.ndarray, label: str = "array") -> dict:
     """Compute diagnostic statistics for a numpy array."""
@@ -23,10 +117,23 @@ def _compute_array_stats(arr: np.ndarray, label: str = "array") -> dict:
         "max": float(arr.max()),
         "mean": float(arr.mean()),
         "nonzero_pct": float(nonzero_count / total * 100) if total > 0 else 0,
-        "md5": hashlib.md5(arr.tobytes()).hexdigest()[:12],
     }
 
 
+def _sampled_nonzero_pct(arr: np.ndarray, stride: int = 64) -> float:
+    """Percentage of nonzero values in a strided sample - enough to spot blank frames."""
+    sample = arr.reshape(-1)[::stride]
+    return float(np.count_nonzero(sample) / sample.size * 100) if sample.size > 0 else 0.0
+
+
+def _rgb_image_flipped(arr: np.ndarray) -> Image.Image:
+    """Build an upright RGB image from a bottom-left-origin HxWx3 array in one pass."""
+    # No-op for the usual contiguous uint8 frames; otherwise cast and densify in one copy
+    arr = np.ascontiguousarray(arr, dtype=np.uint8)
+    height, width = arr.shape[:2]
+    return Image.frombuffer("RGB", (width, height), arr, "raw", "RGB", 0, -1)
+
+
 class RoboSuiteSimulator:
     """
     Wrapper for RoboSuite simulator to test V-JEPA2 predicted actions.
@@ -34,43 +141,59 @@ class RoboSuiteSimulator:
     Converts V-JEPA2/DROID action format to RoboSuite OSC_POSE format.
     """
 
+    # Offscreen renders after which load_state rebuilds the env anyway, since the
+    # OpenGL buffers can get corrupted after many frames
+    REINIT_FRAME_THRESHOLD = 5000
+
     def __init__(self):
         """Initialize the simulator wrapper (lazy loads robosuite)."""
         self.env = None
         self.task = None
         self._initialized = False
+        self._image_key: Optional[str] = None  # Resolved camera key, cached per env
+        self._in_buf = np.empty(7, dtype=np.float64)  # Reused staging for incoming actions
+        self._act_buf = np.empty(7, dtype=np.float32)  # Reused output of _transform_action
+        self._frames_since_init = 0  # Camera renders since the env was built
+        self._fast_step_supported = False  # env exposes the internals _step_without_render uses
 
     def is_initialized(self) -> bool:
         """Check if the simulator is initialized."""
         return self._initialized and self.env is not None
 
-    def initialize(self, task: str = "Lift") -> Image.Image:
+    def initialize(self, task: str = "Lift", force_rebuild: bool = False) -> Image.Image:
         """
         Initialize the RoboSuite environment.
 
+        If an environment for the same task already exists it is reset instead of
+        rebuilt, which skips MuJoCo model compilation and offscreen renderer setup.
+
         Args:
             task: RoboSuite task name (e.g., "Lift", "Stack", "PickPlace")
+            force_rebuild: Always create a fresh environment (and render context)
 
         Returns:
             Initial observation image
         """
-        try:
-            import robosuite as suite
-        except ImportError as e:
-            logger.error(f"Failed to import robosuite: {e}")
+        if _suite is None:
             raise ImportError(
                 "RoboSuite not installed. Install with: pip install robosuite mujoco"
-            ) from e
+            )
+
+        if not force_rebuild and self._initialized and self.env is not None and self.task == task:
+            logger.info(f"[RoboSuiteSimulator] Reusing existing {task} environment")
+            return self.reset()
 
         logger.info(f"[RoboSuiteSimulator] Initializing with task: {task}")
 
         # Close existing environment if any
         if self.env is not None:
             self.env.close()
+        self._image_key = None
+        self._frames_since_init = 0
 
         # Create environment (robosuite 1.5+ uses default controller config automatically)
         # The default Panda controller provides 7-DOF action space [-1, 1]
-        self.env = suite.make(
+        self.env = _suite.make(
             env_name=task,
             robots="Panda",
             has_renderer=False,
@@ -86,14 +209,22 @@ class RoboSuiteSimulator:
         self.task = task
         self._initialized = True
 
+        missing = [a for a in self._FAST_STEP_ATTRS if not hasattr(self.env, a)]
+        self._fast_step_supported = not missing
+        if missing:
+            logger.warning(
+                f"[RoboSuiteSimulator] robosuite internals changed (missing {missing}); "
+                "falling back to env.step for multi-step actions"
+            )
+
         # Reset and get initial observation
         logger.info("[initialize] Calling env.reset()...")
         obs = self.env.reset()
-        logger.info(f"[initialize] env.reset() completed, obs keys: {list(obs.keys())}")
+        logger.info("[initialize] env.reset() completed, obs keys: %s", list(obs))
 
         logger.info("[initialize] Converting observation to image...")
         image = self._obs_to_image(obs)
-        logger.info(f"[initialize] Image created: size={image.size}, mode={image.mode}")
+        logger.info("[initialize] Image created: size=%s, mode=%s", image.size, image.mode)
 
         logger.info("[RoboSuiteSimulator] Initialized successfully")
         return image
@@ -110,32 +241,38 @@ class RoboSuiteSimulator:
 
         logger.info("[reset] Calling env.reset()...")
         obs = self.env.reset()
-        logger.info(f"[reset] env.reset() completed, obs keys: {list(obs.keys())}")
+        logger.info("[reset] env.reset() completed, obs keys: %s", list(obs))
 
         logger.info("[reset] Converting observation to image...")
         image = self._obs_to_image(obs)
-        logger.info(f"[reset] Image created: size={image.size}, mode={image.mode}")
+        logger.info("[reset] Image created: size=%s, mode=%s", image.size, image.mode)
 
         logger.info("[RoboSuiteSimulator] Environment reset completed")
         return image
 
-    def execute_action(self, action: List[float]) -> Dict[str, Any]:
+    def execute_action(self, action: List[float], render_image: bool = True) -> Dict[str, Any]:
         """
         Execute a single action in the simulator.
 
+        The observation dict is dropped before returning and nothing in the result
+        references its arrays: states come back as plain lists and the image is a
+        fresh copy, so no defensive ndarray copies are needed.
+
         Args:
             action: 7-DOF action in V-JEPA2/DROID format:
                    [x, y, z, roll, pitch, yaw, gripper]
                    - Position deltas in meters (~[-0.05, 0.05])
                    - Rotation deltas in radians (~[-0.1, 0.1])
                    - Gripper: negative=open, positive=close (~[-0.75, 0.75])
+            render_image: Convert the camera observation to a PIL image. Rollouts
+                   that only display some frames can pass False to skip it.
 
         Returns:
             Dictionary with:
                 - success: bool
-                - image: PIL Image of resulting observation
-                - robot_state: end-effector position [x, y, z]
-                - gripper_state: gripper state
+                - image: PIL Image of resulting observation (None if render_image=False)
+                - robot_state: end-effector position [x, y, z] (list)
+                - gripper_state: gripper joint positions (list)
                 - reward: float
                 - done: bool
                 - raw_action: original action
@@ -144,41 +281,51 @@ class RoboSuiteSimulator:
         if not self._initialized or self.env is None:
             raise RuntimeError("Simulator not initialized")
 
-        # Convert action to numpy
-        raw_action = list(action)
-        action_np = np.array(action, dtype=np.float32)
+        # Stage the action in the reused float64 buffer (no per-step allocation; float64
+        # keeps raw_action.tolist() identical to the caller's values)
+        action_np = self._in_buf
+        action_np[:] = action
 
         # Transform V-JEPA2/DROID action to RoboSuite OSC_POSE format
         transformed_action = self._transform_action(action_np)
 
-        logger.info(f"[execute_action] Raw action: {[f'{x:.4f}' for x in raw_action]}")
-        logger.debug(f"[execute_action] Transformed action: {[f'{x:.4f}' for x in transformed_action.tolist()]}")
+        # Per-step log lines use lazy %-formatting; the ones that build lists of
+        # formatted numbers are guarded so nothing is built when the level is off
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[execute_action] Raw action: %s", [f'{x:.4f}' for x in action_np.tolist()])
+        if debug_enabled:
+            logger.debug(f"[execute_action] Transformed action: {[f'{x:.4f}' for x in transformed_action.tolist()]}")
 
         # Execute action
         logger.info("[execute_action] Calling env.step()...")
         obs, reward, done, info = self.env.step(transformed_action)
-        logger.info(f"[execute_action] env.step() completed, reward={reward:.4f}, done={done}")
+        logger.info("[execute_action] env.step() completed, reward=%.4f, done=%s", reward, done)
 
         # Log observation keys for debugging
-        obs_keys = list(obs.keys())
-        image_keys = [k for k in obs_keys if 'image' in k.lower()]
-        logger.debug(f"[execute_action] Observation keys: {obs_keys}")
-        logger.info(f"[execute_action] Image keys in obs: {image_keys}")
+        if debug_enabled:
+            obs_keys = list(obs.keys())
+            image_keys = [k for k in obs_keys if 'image' in k.lower()]
+            logger.debug(f"[execute_action] Observation keys: {obs_keys}")
+            logger.debug(f"[execute_action] Image keys in obs: {image_keys}")
 
         # Extract only the data we need (observation filtering for memory efficiency)
-        # Don't keep reference to full obs dict
-        robot_state = obs.get('robot0_eef_pos')
-        if robot_state is not None:
-            robot_state = robot_state.copy()
+        # Plain lists don't reference the obs dict and are ready for JSON serialization
+        robot_state = obs['robot0_eef_pos'].tolist() if 'robot0_eef_pos' in obs else None
+        if robot_state is not None and debug_enabled:
             logger.debug(f"[execute_action] Robot EEF pos: {[f'{x:.4f}' for x in robot_state]}")
 
-        gripper_state = obs.get('robot0_gripper_qpos')
-        if gripper_state is not None:
-            gripper_state = gripper_state.copy()
+        gripper_state = obs['robot0_gripper_qpos'].tolist() if 'robot0_gripper_qpos' in obs else None
 
-        logger.info("[execute_action] Calling _obs_to_image()...")
-        image = self._obs_to_image(obs)
-        logger.info(f"[execute_action] _obs_to_image() returned PIL image: size={image.size}, mode={image.mode}")
+        image = None
+        if render_image:
+            logger.info("[execute_action] Calling _obs_to_image()...")
+            image = self._obs_to_image(obs)
+            logger.info("[execute_action] _obs_to_image() returned PIL image: size=%s, mode=%s", image.size, image.mode)
+        else:
+            # env.step still rendered the camera even though the image is unused
+            self._frames_since_init += 1
 
         # Clear reference to obs dict
         del obs
@@ -190,7 +337,8 @@ class RoboSuiteSimulator:
             "gripper_state": gripper_state,
             "reward": float(reward),
             "done": bool(done),
-            "raw_action": raw_action,
+            # The caller's list is returned as-is; other sequences are converted once
+            "raw_action": action if isinstance(action, list) else action_np.tolist(),
             "transformed_action": transformed_action.tolist(),
         }
 
@@ -199,8 +347,8 @@ class RoboSuiteSimulator:
         Execute the same action for multiple steps, returning only the final observation.
 
         This implementation keeps camera observations enabled to avoid OpenGL context
-        corruption that occurs when toggling use_camera_obs on/off. The overhead is
-        minimal since we don't process the intermediate images.
+        corruption that occurs when toggling use_camera_obs on/off. Intermediate steps
+        go through _step_without_render, so only the final step renders the camera.
 
         Args:
             action: 7-DOF action in V-JEPA2/DROID format
@@ -209,77 +357,187 @@ class RoboSuiteSimulator:
         Returns:
             Dictionary with final state after all steps
         """
-        import gc
-
         if not self._initialized or self.env is None:
             raise RuntimeError("Simulator not initialized")
 
-        # Convert action to numpy
-        raw_action = list(action)
-        action_np = np.array(action, dtype=np.float32)
+        # Stage the action in the reused float64 buffer
+        action_np = self._in_buf
+        action_np[:] = action
 
         # Transform V-JEPA2/DROID action to RoboSuite OSC_POSE format
         transformed_action = self._transform_action(action_np)
 
-        logger.info(f"[RoboSuiteSimulator] Executing {num_steps} steps with action: {raw_action[:3]}...")
+        logger.info("[RoboSuiteSimulator] Executing %d steps with action: %s...", num_steps, action_np[:3])
 
-        total_reward = 0.0
+        # Per-step rewards go into a preallocated array and are summed once at the end
+        rewards = np.empty(num_steps, dtype=np.float64)
         done = False
         steps_executed = 0
         final_obs = None
 
-        # Execute physics steps - keep camera observations enabled to avoid OpenGL corruption
-        # Simply discard intermediate observations to minimize memory usage
+        # Only the last step builds observations (and renders); the others just
+        # advance physics, so no intermediate image buffers are allocated
         for i in range(num_steps):
-            obs, reward, done, info = self.env.step(transformed_action)
-            total_reward += reward
-            steps_executed = i + 1
-
-            # Keep only the final observation
-            if i == num_steps - 1 or done:
-                final_obs = obs
+            if i < num_steps - 1:
+                reward, done, info = self._step_without_render(transformed_action)
             else:
-                # Discard intermediate observations
-                del obs
+                final_obs, reward, done, info = self.env.step(transformed_action)
+            rewards[i] = reward
+            steps_executed = i + 1
 
             if done:
                 logger.info(f"[RoboSuiteSimulator] Episode ended after {steps_executed} steps")
                 break
 
-            # Periodic garbage collection to prevent memory buildup
-            if i > 0 and i % 25 == 0:
-                gc.collect()
+        if final_obs is None:
+            # Episode ended on an intermediate step - observe the current state once
+            final_obs = self.env._get_observations(force_update=True)
 
         # Extract data from final observation
-        robot_state = final_obs.get('robot0_eef_pos')
-        if robot_state is not None:
-            robot_state = robot_state.copy()
-
-        gripper_state = final_obs.get('robot0_gripper_qpos')
-        if gripper_state is not None:
-            gripper_state = gripper_state.copy()
+        robot_state = final_obs['robot0_eef_pos'].tolist() if 'robot0_eef_pos' in final_obs else None
+        gripper_state = final_obs['robot0_gripper_qpos'].tolist() if 'robot0_gripper_qpos' in final_obs else None
 
         # Convert final observation to image
         image = self._obs_to_image(final_obs)
-
-        # Clean up
         del final_obs
-        gc.collect()
 
-        logger.info(f"[RoboSuiteSimulator] Batch complete: {steps_executed} steps, total_reward={total_reward:.4f}")
+        total_reward = float(rewards[:steps_executed].sum())
+        logger.info("[RoboSuiteSimulator] Batch complete: %d steps, total_reward=%.4f", steps_executed, total_reward)
 
         return {
             "success": True,
             "image": image,
             "robot_state": robot_state,
             "gripper_state": gripper_state,
-            "reward": float(total_reward),
+            "reward": total_reward,
             "done": bool(done),
             "steps_executed": steps_executed,
-            "raw_action": raw_action,
+            # The caller's list is returned as-is; other sequences are converted once
+            "raw_action": action if isinstance(action, list) else action_np.tolist(),
             "transformed_action": transformed_action.tolist(),
         }
 
+    def execute_actions(self, actions: List[List[float]]) -> Dict[str, Any]:
+        """
+        Execute a sequence of different actions, returning only the final observation.
+
+        All actions are transformed into one preallocated buffer up front, then
+        stepped in a tight loop without per-step logging. Only the last step
+        renders the camera. Stops early if the episode ends.
+
+        Args:
+            actions: List of 7-DOF actions in V-JEPA2/DROID format
+
+        Returns:
+            Dictionary with final state after all steps, plus per-step rewards
+        """
+        if not self._initialized or self.env is None:
+            raise RuntimeError("Simulator not initialized")
+        if len(actions) == 0:
+            raise ValueError("No actions to execute")
+
+        # Convert the whole sequence once, then transform every action into one buffer.
+        # The transform kernel does no bounds checks, so every row must have 7 values
+        actions_np = np.asarray(actions, dtype=np.float64)
+        if actions_np.ndim != 2 or actions_np.shape[1] != 7:
+            raise ValueError(f"Expected actions of shape (N, 7), got {actions_np.shape}")
+        transformed = np.empty((len(actions_np), 7), dtype=np.float32)
+        for i in range(len(actions_np)):
+            transformed[i] = self._transform_action(actions_np[i])
+
+        logger.info("[RoboSuiteSimulator] Executing %d actions", len(actions))
+
+        rewards = np.empty(len(actions), dtype=np.float64)
+        steps_executed = 0
+        done = False
+        obs = None
+        last = len(actions) - 1
+        for i in range(len(actions)):
+            if i < last:
+                reward, done, info = self._step_without_render(transformed[i])
+            else:
+                obs, reward, done, info = self.env.step(transformed[i])
+            rewards[i] = reward
+            steps_executed = i + 1
+            if done:
+                logger.info(f"[RoboSuiteSimulator] Episode ended after {i + 1} actions")
+                break
+
+        if obs is None:
+            obs = self.env._get_observations(force_update=True)
+
+        rewards = rewards[:steps_executed]
+        total_reward = float(rewards.sum())
+        robot_state = obs['robot0_eef_pos'].tolist() if 'robot0_eef_pos' in obs else None
+        gripper_state = obs['robot0_gripper_qpos'].tolist() if 'robot0_gripper_qpos' in obs else None
+        image = self._obs_to_image(obs)
+        del obs
+
+        logger.info("[RoboSuiteSimulator] Actions complete: %d steps, total_reward=%.4f", steps_executed, total_reward)
+
+        return {
+            "success": True,
+            "image": image,
+            "robot_state": robot_state,
+            "gripper_state": gripper_state,
+            "rewards": rewards.tolist(),
+            "reward": total_reward,
+            "done": bool(done),
+            "steps_executed": steps_executed,
+            "transformed_actions": transformed[:steps_executed].tolist(),
+        }
+
+    # MujocoEnv internals used by _step_without_render, checked once per env build
+    _FAST_STEP_ATTRS = (
+        "done", "timestep", "cur_time", "control_timestep", "model_timestep", "sim",
+        "_pre_action", "_post_action", "_observables", "_obs_cache",
+    )
+
+    def _step_without_render(self, action: np.ndarray):
+        """
+        Advance one control step without collecting observations.
+
+        Mirrors MujocoEnv.step from robosuite 1.5.x, except that camera
+        observables are not updated and _get_observations is skipped, which is
+        where the offscreen camera renders. Non-camera observables are still
+        updated every substep. Camera observations stay enabled; they are just
+        not sampled for this step. If the env lacks the private attributes this
+        relies on (checked in initialize), env.step is used instead.
+
+        Returns:
+            (reward, done, info) as returned by env.step
+        """
+        env = self.env
+        if not self._fast_step_supported:
+            _, reward, done, info = env.step(action)
+            return reward, done, info
+
+        if env.done:
+            raise ValueError("executing action in terminated episode")
+
+        env.timestep += 1
+        policy_step = True
+        lite_physics = getattr(env, "lite_physics", False)
+        for _ in range(int(env.control_timestep / env.model_timestep)):
+            if lite_physics:
+                env.sim.step1()
+            else:
+                env.sim.forward()
+            env._pre_action(action, policy_step)
+            if lite_physics:
+                env.sim.step2()
+            else:
+                env.sim.step()
+            for observable in env._observables.values():
+                if observable.modality != "image":
+                    observable.update(
+                        timestep=env.model_timestep, obs_cache=env._obs_cache, force=False
+                    )
+            policy_step = False
+
+        env.cur_time += env.control_timestep
+        return env._post_action(action)
+
     def _render_final_frame(self) -> Image.Image:
         """
         Render the current frame using MuJoCo's offscreen renderer directly.
@@ -288,6 +546,7 @@ class RoboSuiteSimulator:
         """
         # Ensure physics is synced
         self.env.sim.forward()
+        self._frames_since_init += 1
 
         # Use MuJoCo's offscreen rendering directly
         # This is more reliable than going through robosuite's observation system
@@ -299,9 +558,7 @@ class RoboSuiteSimulator:
         )
 
         # MuJoCo renders with origin at bottom-left, flip vertically
-        img = np.flipud(img)
-
-        return Image.fromarray(img.astype(np.uint8))
+        return _rgb_image_flipped(img)
 
     def _render_current_frame(self) -> Image.Image:
         """
@@ -321,26 +578,6 @@ class RoboSuiteSimulator:
 
         return image
 
-    def _euler_to_axis_angle(self, roll: float, pitch: float, yaw: float) -> np.ndarray:
-        """
-        Convert Euler angles (roll, pitch, yaw) to axis-angle representation.
-
-        Uses scipy's Rotation class for robust, well-tested conversion.
-        The 'xyz' convention means intrinsic rotations: X (roll), Y (pitch), Z (yaw).
-
-        Args:
-            roll: Rotation about X-axis in radians
-            pitch: Rotation about Y-axis in radians
-            yaw: Rotation about Z-axis in radians
-
-        Returns:
-            3D axis-angle vector [ax, ay, az] where magnitude is the rotation angle
-        """
-        from scipy.spatial.transform import Rotation
-
-        r = Rotation.from_euler('xyz', [roll, pitch, yaw])
-        return r.as_rotvec()  # axis-angle representation
-
     def _transform_action(self, action: np.ndarray) -> np.ndarray:
         """
         Transform V-JEPA2/DROID action format to RoboSuite OSC_POSE format.
@@ -361,38 +598,15 @@ class RoboSuiteSimulator:
             action: 7-DOF action in V-JEPA2/DROID format
 
         Returns:
-            7-DOF action in RoboSuite format
+            7-DOF action in RoboSuite format (a reused buffer, overwritten by the next call)
         """
-        # Extract components
-        pos_delta = action[:3]  # x, y, z position deltas
-        rot_euler = action[3:6]  # roll, pitch, yaw rotation deltas (Euler angles)
-        gripper = action[6]  # gripper command
-
-        # Scale position deltas for RoboSuite controller
-        # V-JEPA2 outputs small deltas (~0.01-0.05), RoboSuite expects similar scale
-        pos_scaled = pos_delta * 1.0  # Adjust scale if needed
-
-        # Convert Euler angles (roll, pitch, yaw) to axis-angle representation
-        # This is the proper conversion for RoboSuite's OSC_POSE controller
-        rot_axis_angle = self._euler_to_axis_angle(
-            roll=rot_euler[0],
-            pitch=rot_euler[1],
-            yaw=rot_euler[2]
-        )
+        # Filled in place: the result is only used until the next transform.
+        # V-JEPA2 outputs small deltas (~0.01-0.05), RoboSuite expects similar scale;
+        # V-JEPA2 gripper: negative=open, positive=close; RoboSuite: -1=open, 1=close
+        buf = self._act_buf
+        _transform_action_kernel(action, buf)
 
-        # Normalize gripper to [-1, 1] range
-        # V-JEPA2: negative=open, positive=close
-        # RoboSuite: -1=open, 1=close
-        gripper_normalized = np.clip(gripper, -1.0, 1.0)
-
-        # Combine into RoboSuite action
-        robosuite_action = np.concatenate([
-            pos_scaled,
-            rot_axis_angle,
-            [gripper_normalized]
-        ])
-
-        return robosuite_action
+        return buf
 
     def _obs_to_image(self, obs: Dict[str, Any]) -> Image.Image:
         """
@@ -404,57 +618,47 @@ class RoboSuiteSimulator:
         Returns:
             PIL Image
         """
-        # Get the camera observation
-        img_key = None
-        if "agentview_image" in obs:
-            img_key = "agentview_image"
-            img_array = obs["agentview_image"]
-        elif "image" in obs:
-            img_key = "image"
-            img_array = obs["image"]
-        else:
-            # Try to find any image key
-            for key in obs:
-                if "image" in key.lower():
-                    img_key = key
-                    img_array = obs[key]
-                    break
+        # Get the camera observation (key is resolved once per environment)
+        img_key = self._image_key
+        if img_key is None or img_key not in obs:
+            if "agentview_image" in obs:
+                img_key = "agentview_image"
+            elif "image" in obs:
+                img_key = "image"
             else:
-                raise ValueError(f"No image found in observation. Keys: {list(obs.keys())}")
-
-        # Log raw array stats BEFORE any processing
-        raw_stats = _compute_array_stats(img_array, f"raw_{img_key}")
-        is_corrupted = raw_stats["nonzero_pct"] < 5.0
-
-        if is_corrupted:
-            logger.warning(
-                f"[_obs_to_image] ⚠️ RAW ARRAY CORRUPTED! key={img_key}, "
-                f"shape={raw_stats['shape']}, dtype={raw_stats['dtype']}, "
-                f"nonzero={raw_stats['nonzero_pct']:.1f}%, mean={raw_stats['mean']:.1f}, "
-                f"md5={raw_stats['md5']}"
-            )
-        else:
-            logger.info(
-                f"[_obs_to_image] Raw array OK: key={img_key}, shape={raw_stats['shape']}, "
-                f"nonzero={raw_stats['nonzero_pct']:.1f}%, mean={raw_stats['mean']:.1f}, "
-                f"md5={raw_stats['md5']}"
-            )
-
-        # Convert to PIL Image
-        # RoboSuite returns images with origin at bottom-left, so flip vertically
-        img_array_flipped = np.flipud(img_array)
-
-        # Log after flip
-        flipped_stats = _compute_array_stats(img_array_flipped, "flipped")
-        logger.debug(
-            f"[_obs_to_image] After flip: md5={flipped_stats['md5']} "
-            f"(should differ from raw if not symmetric)"
-        )
+                # Try to find any image key
+                img_key = next((key for key in obs if "image" in key.lower()), None)
+                if img_key is None:
+                    raise ValueError(f"No image found in observation. Keys: {list(obs.keys())}")
+            self._image_key = img_key
+        img_array = obs[img_key]
+        self._frames_since_init += 1
+
+        # Blank-frame check (broken GL context) on a strided sample of the raw array;
+        # full stats are only computed when they will actually be logged
+        is_corrupted = _sampled_nonzero_pct(img_array) < 5.0
+        if is_corrupted or logger.isEnabledFor(logging.INFO):
+            raw_stats = _compute_array_stats(img_array, f"raw_{img_key}")
+
+            if is_corrupted:
+                logger.warning(
+                    f"[_obs_to_image] ⚠️ RAW ARRAY CORRUPTED! key={img_key}, "
+                    f"shape={raw_stats['shape']}, dtype={raw_stats['dtype']}, "
+                    f"nonzero={raw_stats['nonzero_pct']:.1f}%, mean={raw_stats['mean']:.1f}"
+                )
+            else:
+                logger.info(
+                    f"[_obs_to_image] Raw array OK: key={img_key}, shape={raw_stats['shape']}, "
+                    f"nonzero={raw_stats['nonzero_pct']:.1f}%, mean={raw_stats['mean']:.1f}"
+                )
 
-        # Create PIL image - make a copy to avoid reference issues
-        pil_img = Image.fromarray(img_array_flipped.astype(np.uint8).copy())
+        # Convert to PIL Image (agentview images are already uint8, so no cast).
+        # RoboSuite returns images with origin at bottom-left, so flip vertically.
+        # A -1 orientation makes the raw decoder read rows bottom-up, so the flip
+        # happens in the single copy into a new image (nothing aliases the obs buffer)
+        pil_img = _rgb_image_flipped(img_array)
 
-        logger.debug(f"[_obs_to_image] PIL Image created: size={pil_img.size}, mode={pil_img.mode}")
+        logger.debug("[_obs_to_image] PIL Image created: size=%s, mode=%s", pil_img.size, pil_img.mode)
 
         return pil_img
 
@@ -463,10 +667,11 @@ class RoboSuiteSimulator:
         Save current simulator state to bytes (for download).
 
         Returns:
-            bytes: Pickled state data containing:
-                - sim_state: MuJoCo qpos, qvel, act, time
-                - rng_state: NumPy RNG state for reproducibility
+            bytes: NumPy .npz archive containing:
+                - sim_state: Flattened MuJoCo state (time, qpos, qvel)
+                - rng_state: NumPy RNG state (JSON) for reproducibility
                 - task: Current task name
+                - last_image: Rendered frame (uint8 HxWx3) so load_state can skip re-rendering
 
         Raises:
             RuntimeError: If simulator is not initialized
@@ -474,26 +679,37 @@ class RoboSuiteSimulator:
         if self.env is None or not self._initialized:
             raise RuntimeError("Simulator not initialized")
 
-        sim_state = self.env.sim.get_state()
+        sim_state = self.env.sim.get_state().flatten()
         rng_state = None
         if hasattr(self.env, "np_random") and self.env.np_random is not None:
             rng_state = self.env.np_random.bit_generator.state
 
-        payload = {
-            "sim_state": sim_state,
-            "rng_state": rng_state,
-            "task": self.task,
-        }
+        # Capture the current frame (already flipped upright) alongside the state.
+        # Only the camera is needed, so render it directly instead of building
+        # the full observation dict
+        last_image = np.asarray(self._render_final_frame())
+
+        # Store raw buffers in an .npz archive - no pickled objects, so the
+        # downloaded file is safe to load back with allow_pickle=False.
+        # The RNG state holds 128-bit ints, so it is kept as a JSON string.
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            sim_state=sim_state,
+            rng_state=np.array(json.dumps(rng_state)),
+            task=np.array(self.task),
+            last_image=last_image,
+        )
 
         logger.info(f"[RoboSuiteSimulator] Saving state for task: {self.task}")
-        return pickle.dumps(payload)
+        return buffer.getvalue()
 
     def load_state(self, state_data: bytes) -> Image.Image:
         """
         Load simulator state from bytes.
 
         Args:
-            state_data: Pickled state data from save_state()
+            state_data: .npz state data from save_state()
 
         Returns:
             PIL Image of the restored state
@@ -501,21 +717,24 @@ class RoboSuiteSimulator:
         Raises:
             RuntimeError: If state data is invalid
         """
-        payload = pickle.loads(state_data)
-
-        sim_state = payload["sim_state"]
-        rng_state = payload.get("rng_state")
-        task = payload.get("task", "Lift")
+        with np.load(io.BytesIO(state_data), allow_pickle=False) as payload:
+            sim_state = payload["sim_state"]
+            rng_state = json.loads(payload["rng_state"].item()) if "rng_state" in payload else None
+            task = payload["task"].item() if "task" in payload else "Lift"
+            last_image = payload["last_image"] if "last_image" in payload else None
 
         logger.info(f"[RoboSuiteSimulator] Loading state for task: {task}")
 
-        # ALWAYS reinitialize to get a fresh rendering context
-        # This fixes OpenGL buffer corruption that happens after many frames
-        logger.info(f"[RoboSuiteSimulator] Reinitializing environment for clean render context")
-        self.initialize(task=task)
+        # Reuse the env (just reset it) when the task is already loaded. Rebuild it for
+        # a different task, or after many frames to get a fresh rendering context -
+        # this fixes OpenGL buffer corruption that happens after many frames
+        needs_rebuild = self._frames_since_init >= self.REINIT_FRAME_THRESHOLD
+        if needs_rebuild:
+            logger.info(f"[RoboSuiteSimulator] Reinitializing environment for clean render context")
+        self.initialize(task=task, force_rebuild=needs_rebuild)
 
         # Restore MuJoCo sim state
-        self.env.sim.set_state(sim_state)
+        self.env.sim.set_state_from_flattened(sim_state)
         self.env.sim.forward()  # Recompute derived quantities
 
         # Restore RNG if saved
@@ -524,9 +743,12 @@ class RoboSuiteSimulator:
 
         logger.info("[RoboSuiteSimulator] State restored successfully")
 
-        # Get the observation with properly rendered image
-        obs = self.env._get_observations()
-        return self._obs_to_image(obs)
+        # Reuse the frame captured at save time instead of rendering again
+        if last_image is not None:
+            return Image.fromarray(last_image)
+
+        # Payload has no saved frame - render just the camera from the restored state
+        return self._render_final_frame()
 
     def close(self):
         """Close the simulator and release resources."""
@@ -537,18 +759,17 @@ class RoboSuiteSimulator:
             self.env = None
         self._initialized = False
         self.task = None
+        self._image_key = None
 
-        # Aggressive memory cleanup after closing simulator
-        # MuJoCo can hold significant memory that needs to be released
+        # Memory cleanup after closing simulator - references above are already
+        # dropped, so a single full collection sweeps whatever the env left behind
         gc.collect()
-        gc.collect()  # Second pass for cyclic references
 
         # On Apple Silicon, also clear MPS cache to release GPU memory
         try:
             import torch
             if torch.backends.mps.is_available():
                 torch.mps.empty_cache()
-                torch.mps.synchronize()
                 logger.info("[RoboSuiteSimulator] MPS cache cleared")
         except Exception:
             pass  # MPS not available or torch not imported
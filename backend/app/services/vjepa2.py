@@ -4,6 +4,9 @@ V-JEPA2 model service for real inference on Apple Silicon (MPS) and CUDA.
 Optimized for MacBook M4 with 16GB unified memory.
 """
 
+import asyncio
+import contextlib
+import functools
 import logging
 import os
 import time
@@ -12,9 +15,11 @@ import json
 import hashlib
 import shutil
 import math
+import mmap
 from dataclasses import dataclass
 from typing import Optional, Tuple, List, Dict, Any, Callable
 from pathlib import Path
+from urllib.parse import urlparse
 from collections import OrderedDict
 
 import torch
@@ -26,9 +31,32 @@ from tqdm import tqdm
 
 logger = logging.getLogger(__name__)
 
+# Optional dependency: BLAKE3 hashes multi-GB checkpoints much faster than SHA-256
+# (SIMD + multithreaded, mmap-backed). Falls back to hashlib's C loop without it.
+try:
+    import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
 # Global download progress tracking
 _download_progress: Dict[str, Dict[str, Any]] = {}
 _download_progress_lock = threading.Lock()
+_download_subscribers: Dict[str, List["DownloadProgressSubscription"]] = {}
+
+
+class _LiveDownloadCounters:
+    """Byte counters the downloader thread updates without taking the lock."""
+
+    __slots__ = ("downloaded", "total", "start_time")
+
+    def __init__(self):
+        self.downloaded = 0
+        self.total = 0
+        self.start_time = time.monotonic()
+
+
+# Active torch.hub downloads, merged into progress snapshots when read
+_live_downloads: Dict[str, _LiveDownloadCounters] = {}
 
 # Enable MPS fallback for unsupported operations
 os.environ['PYTORCH_ENABLE_MPS_FALLBACK'] = '1'
@@ -36,10 +64,109 @@ os.environ['PYTORCH_ENABLE_MPS_FALLBACK'] = '1'
 # CRITICAL: Configure MPS memory allocator to prevent memory fragmentation
 # This is essential for stable multi-step planning without slowdown
 # Set to 'low_watermark_ratio' to release memory more aggressively
-os.environ['PYTORCH_MPS_HIGH_WATERMARK_RATIO'] = '0.0'  # Disable high watermark (release immediately)
 os.environ['PYTORCH_MPS_LOW_WATERMARK_RATIO'] = '0.0'   # Don't keep any memory pool reserve
 
 
+def _apply_mps_memory_fraction() -> None:
+    """
+    Cap this process's MPS allocations to a fraction of the recommended GPU budget.
+
+    Past the cap allocations raise a catchable "MPS backend out of memory" error
+    instead of pushing macOS into swap or killing the process.
+    """
+    from app.config import settings
+
+    if not torch.backends.mps.is_available() or settings.mps_memory_fraction <= 0:
+        return
+    try:
+        torch.mps.set_per_process_memory_fraction(settings.mps_memory_fraction)
+    except AttributeError:  # PyTorch without the MPS memory-fraction API
+        return
+    logger.info(f"MPS memory fraction capped at {settings.mps_memory_fraction:.2f}")
+
+
+_apply_mps_memory_fraction()
+
+
+@torch.jit.script
+def embedding_l1_distance(a: torch.Tensor, b: torch.Tensor) -> torch.Tensor:
+    """Mean L1 distance between two embeddings (same metric as CEM energy)."""
+    return F.l1_loss(a, b)
+
+
+def _compute_file_checksum(path: Path, algorithm: Optional[str] = None) -> str:
+    """
+    Hash a file and return "<algorithm>:<hexdigest>".
+
+    Defaults to blake3 when installed, otherwise sha256.
+    """
+    if algorithm is None:
+        algorithm = "blake3" if _blake3 is not None else "sha256"
+
+    if algorithm == "blake3":
+        if _blake3 is None:
+            raise RuntimeError("blake3 checksum requested but blake3 is not installed")
+        hasher = _blake3.blake3(max_threads=_blake3.blake3.AUTO)
+        hasher.update_mmap(str(path))
+        return f"blake3:{hasher.hexdigest()}"
+
+    digest = hashlib.new(algorithm)
+    with open(path, "rb", buffering=0) as f:
+        if os.fstat(f.fileno()).st_size == 0:  # mmap cannot map an empty file
+            return f"{algorithm}:{digest.hexdigest()}"
+        # Feed zero-copy slices of the mapped file straight to OpenSSL (no read buffers)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)  # Let the kernel read ahead aggressively
+            view = memoryview(mm)
+            try:
+                chunk_size = 1 << 22  # 4 MiB
+                for offset in range(0, len(view), chunk_size):
+                    digest.update(view[offset:offset + chunk_size])
+            finally:
+                view.release()  # mmap cannot close while a view is exported
+    return f"{algorithm}:{digest.hexdigest()}"
+
+
+def _file_stat_signature(path: Path) -> Dict[str, int]:
+    """Size, mtime and inode of a file - unchanged means the file was not rewritten."""
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino}
+
+
+def available_memory_gb() -> Optional[float]:
+    """
+    GPU memory still available to this process, in GB.
+
+    On MPS this is the driver's recommended budget - scaled by settings.mps_memory_fraction
+    when that cap is active - minus what the driver has already allocated. Returns None on
+    CPU or when the PyTorch build cannot report it.
+    """
+    from app.config import settings
+
+    try:
+        if torch.backends.mps.is_available():
+            budget_bytes = torch.mps.recommended_max_memory()
+            if settings.mps_memory_fraction > 0:
+                budget_bytes *= settings.mps_memory_fraction
+            free_bytes = max(0, budget_bytes - torch.mps.driver_allocated_memory())
+        elif torch.cuda.is_available():
+            free_bytes, _ = torch.cuda.mem_get_info()
+        else:
+            return None
+    except AttributeError:  # PyTorch < 2.3
+        return None
+    return free_bytes / (1024 ** 3)
+
+
+def _mps_memory_pressure(threshold: float = 0.75) -> bool:
+    """True when the MPS driver holds more than `threshold` of the recommended GPU budget."""
+    try:
+        return torch.mps.driver_allocated_memory() > threshold * torch.mps.recommended_max_memory()
+    except AttributeError:  # PyTorch < 2.3 cannot tell - assume pressure and clean up
+        return True
+
+
 @dataclass
 class DeviceInfo:
     """Information about the compute device."""
@@ -51,28 +178,53 @@ class DeviceInfo:
     max_batch_size: int
 
 
+def _physical_memory_bytes() -> int:
+    """Total physical memory, via sysconf (no subprocess) with a sysctl fallback."""
+    try:
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        phys_pages = os.sysconf("SC_PHYS_PAGES")
+        if page_size > 0 and phys_pages > 0:
+            return page_size * phys_pages
+    except (ValueError, OSError, AttributeError):
+        pass
+
+    import subprocess
+    result = subprocess.run(
+        ['sysctl', '-n', 'hw.memsize'],
+        capture_output=True, text=True
+    )
+    return int(result.stdout.strip())
+
+
+@functools.cache
 def get_device_info() -> DeviceInfo:
-    """Detect the best available device and its capabilities."""
+    """
+    Detect the best available device and its capabilities.
+
+    Cached for the life of the process - the device does not change, and every
+    VJEPA2ModelLoader asks for it. Treat the returned DeviceInfo as read-only.
+    """
 
     if torch.backends.mps.is_available():
         # Apple Silicon (M1/M2/M3/M4)
         # Get approximate memory from system
         try:
-            import subprocess
-            result = subprocess.run(
-                ['sysctl', '-n', 'hw.memsize'],
-                capture_output=True, text=True
-            )
-            memory_bytes = int(result.stdout.strip())
-            memory_gb = memory_bytes / (1024 ** 3)
+            system_memory_gb = _physical_memory_bytes() / (1024 ** 3)
         except Exception:
-            memory_gb = 16.0  # Assume 16GB if detection fails
+            system_memory_gb = 16.0  # Assume 16GB if detection fails
 
-        # Determine recommended model based on memory
-        if memory_gb >= 32:
+        # The GPU can only use the driver's working-set budget (~2/3 of unified memory),
+        # not total RAM, so size recommendations from that
+        try:
+            memory_gb = torch.mps.recommended_max_memory() / (1024 ** 3)
+        except AttributeError:  # PyTorch < 2.3
+            memory_gb = system_memory_gb * 2 / 3
+
+        # Determine recommended model based on GPU budget (32GB / 16GB Macs -> ~21GB / ~11GB)
+        if memory_gb >= 20:
             recommended = "vit-huge"
             max_batch = 4
-        elif memory_gb >= 16:
+        elif memory_gb >= 10:
             recommended = "vit-large"
             max_batch = 2
         else:
@@ -81,7 +233,7 @@ def get_device_info() -> DeviceInfo:
 
         return DeviceInfo(
             device_type="mps",
-            device_name=f"Apple Silicon ({memory_gb:.0f}GB unified)",
+            device_name=f"Apple Silicon ({system_memory_gb:.0f}GB unified)",
             memory_gb=memory_gb,
             supports_fp16=True,
             recommended_model=recommended,
@@ -130,51 +282,175 @@ def get_device_info() -> DeviceInfo:
         )
 
 
+class DownloadProgressSubscription:
+    """
+    Async iterator over download progress for one model.
+
+    The downloader thread wakes the subscriber's event loop only when progress
+    is published, instead of the consumer polling on a timer. Wakeups are
+    coalesced: while one is pending, further updates just replace the stored
+    progress, so a slow consumer always reads the latest value. Iteration ends
+    when the download progress is cleared.
+    """
+
+    def __init__(self, model_id: str, loop: asyncio.AbstractEventLoop):
+        self.model_id = model_id
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._wakeup_pending = False  # Guarded by _download_progress_lock
+
+    def _notify(self, done: bool = False) -> None:
+        """
+        Wake the consumer.
+
+        Normally called with _download_progress_lock held. The download hot path
+        calls it without the lock; a race there only adds a redundant wakeup or
+        defers one to the next update (the final clear always wakes).
+        """
+        if not done and self._wakeup_pending:
+            return
+        self._wakeup_pending = True
+        try:
+            # None is the end-of-download sentinel
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, None if done else True)
+        except RuntimeError:
+            pass  # Consumer's event loop already closed
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        item = await self._queue.get()
+        with _download_progress_lock:
+            self._wakeup_pending = False
+            progress = _progress_snapshot(self.model_id)
+        if item is None or progress is None:
+            raise StopAsyncIteration
+        return progress
+
+
+def subscribe_download_progress(model_id: str) -> DownloadProgressSubscription:
+    """Subscribe the running event loop to download progress updates for a model."""
+    subscription = DownloadProgressSubscription(model_id, asyncio.get_running_loop())
+    with _download_progress_lock:
+        _download_subscribers.setdefault(model_id, []).append(subscription)
+        if model_id in _download_progress or model_id in _live_downloads:
+            subscription._notify()  # Deliver current progress immediately
+    return subscription
+
+
+def unsubscribe_download_progress(subscription: DownloadProgressSubscription) -> None:
+    """Stop delivering download progress to a subscription."""
+    with _download_progress_lock:
+        subscribers = _download_subscribers.get(subscription.model_id)
+        if subscribers and subscription in subscribers:
+            subscribers.remove(subscription)
+            if not subscribers:
+                del _download_subscribers[subscription.model_id]
+
+
+def _progress_snapshot(model_id: str) -> Optional[Dict[str, Any]]:
+    """Stored progress merged with live download counters (call with the lock held)."""
+    progress = _download_progress.get(model_id)
+    counters = _live_downloads.get(model_id)
+    if counters is None or not counters.total:
+        return progress
+    live = {
+        "downloaded": counters.downloaded,
+        "total": counters.total,
+        "elapsed": time.monotonic() - counters.start_time,
+    }
+    return {**progress, **live} if progress else live
+
+
 def get_download_progress(model_id: str) -> Optional[Dict[str, Any]]:
     """Get download progress for a model."""
     with _download_progress_lock:
-        return _download_progress.get(model_id)
+        return _progress_snapshot(model_id)
 
 
 def set_download_progress(model_id: str, progress: Dict[str, Any]) -> None:
-    """Set download progress for a model."""
+    """Set download progress for a model and wake any subscribers."""
     with _download_progress_lock:
         _download_progress[model_id] = progress
+        for subscription in _download_subscribers.get(model_id, ()):
+            subscription._notify()
 
 
 def clear_download_progress(model_id: str) -> None:
-    """Clear download progress for a model."""
+    """Clear download progress for a model and end any subscriptions."""
     with _download_progress_lock:
         _download_progress.pop(model_id, None)
+        for subscription in _download_subscribers.get(model_id, ()):
+            subscription._notify(done=True)
 
 
-class ProgressTrackingTqdm(tqdm):
-    """Custom tqdm class that tracks progress to a global dict."""
+# Checkpoint filenames PyTorch Hub downloads for each model
+_HUB_CHECKPOINT_FILES = {
+    "vit-large": "vitl.pt",
+    "vit-huge": "vith.pt",
+    "vit-giant": "vitg.pt",
+    "vit-giant-ac": "vjepa2-ac-vitg.pt",  # Actual filename from PyTorch Hub
+}
+_HUB_FILE_TO_MODEL_ID = {filename: model_id for model_id, filename in _HUB_CHECKPOINT_FILES.items()}
+
+# Which model the current thread is downloading (set by the patched torch.hub download)
+_download_tls = threading.local()
 
-    _current_model_id: Optional[str] = None
-    _start_time: Optional[float] = None
 
-    @classmethod
-    def set_model_id(cls, model_id: str):
-        cls._current_model_id = model_id
-        cls._start_time = time.time()
+class ProgressTrackingTqdm(tqdm):
+    """
+    Custom tqdm class that tracks progress for the model its thread is downloading.
+
+    Installed as torch.hub.tqdm permanently; the model is looked up in _download_tls
+    once per bar, so concurrent downloads on different threads don't interfere.
+    update() runs for every downloaded chunk, so it only writes two ints into the
+    model's _LiveDownloadCounters (no lock, no dict allocation). Readers build the
+    progress dict from those counters when they actually need it, and subscribers
+    are woken at most every PUBLISH_INTERVAL seconds (plus once at completion).
+    """
 
-    @classmethod
-    def clear_model_id(cls):
-        cls._current_model_id = None
-        cls._start_time = None
+    PUBLISH_INTERVAL = 0.1  # 10 Hz - the frontend only polls at 1-2 Hz
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._next_publish = 0.0
+        self._model_id: Optional[str] = getattr(_download_tls, "model_id", None)
+        self._counters: Optional[_LiveDownloadCounters] = getattr(_download_tls, "counters", None)
+
+    @staticmethod
+    def set_model_id(model_id: str):
+        counters = _LiveDownloadCounters()
+        with _download_progress_lock:
+            _live_downloads[model_id] = counters
+        _download_tls.model_id = model_id
+        _download_tls.counters = counters
+
+    @staticmethod
+    def clear_model_id():
+        model_id = getattr(_download_tls, "model_id", None)
+        if model_id is not None:
+            with _download_progress_lock:
+                _live_downloads.pop(model_id, None)
+        _download_tls.model_id = None
+        _download_tls.counters = None
 
     def update(self, n=1):
         """Override update to track progress."""
         result = super().update(n)
 
-        if self._current_model_id and self.total:
-            elapsed = time.time() - (self._start_time or time.time())
-            set_download_progress(self._current_model_id, {
-                "downloaded": self.n,
-                "total": self.total,
-                "elapsed": elapsed,
-            })
+        counters = self._counters
+        if counters is not None and self.total:
+            # Plain attribute stores are atomic under the GIL
+            counters.downloaded = self.n
+            counters.total = self.total
+            subscribers = _download_subscribers.get(self._model_id)
+            if subscribers:
+                now = time.monotonic()
+                if now >= self._next_publish or self.n >= self.total:
+                    self._next_publish = now + self.PUBLISH_INTERVAL
+                    for subscription in subscribers:
+                        subscription._notify()
 
         return result
 
@@ -182,28 +458,17 @@ class ProgressTrackingTqdm(tqdm):
 def _patch_torch_hub_download():
     """Patch torch.hub to use our progress-tracking tqdm."""
     import torch.hub
-    import functools
-    import sys
-    import importlib
 
-    # Store original tqdm
-    original_tqdm = tqdm
+    # Installed once; bars only report when their thread is inside patched_download
+    torch.hub.tqdm = ProgressTrackingTqdm
 
     # Store original download function
     original_download = torch.hub.download_url_to_file
 
     @functools.wraps(original_download)
     def patched_download(url, dst, hash_prefix=None, progress=True):
-        # Extract model ID from URL
-        model_id = None
-        if "vitl" in url.lower():
-            model_id = "vit-large"
-        elif "vith" in url.lower():
-            model_id = "vit-huge"
-        elif "ac_vitg" in url.lower() or "ac-vitg" in url.lower():
-            model_id = "vit-giant-ac"
-        elif "vitg" in url.lower():
-            model_id = "vit-giant"
+        # Map the downloaded file (named as torch.hub names it) back to the model ID
+        model_id = _HUB_FILE_TO_MODEL_ID.get(os.path.basename(urlparse(url).path))
 
         if model_id:
             logger.info(f"Tracking download progress for {model_id}")
@@ -211,16 +476,11 @@ def _patch_torch_hub_download():
             set_download_progress(model_id, {"downloaded": 0, "total": 1, "elapsed": 0})
 
         try:
-            # Temporarily replace tqdm in torch.hub module
-            torch.hub.tqdm = ProgressTrackingTqdm
-            result = original_download(url, dst, hash_prefix=hash_prefix, progress=progress)
-            return result
+            return original_download(url, dst, hash_prefix=hash_prefix, progress=progress)
         finally:
-            # Restore original tqdm
-            torch.hub.tqdm = original_tqdm
             if model_id:
-                clear_download_progress(model_id)
                 ProgressTrackingTqdm.clear_model_id()
+                clear_download_progress(model_id)
 
     torch.hub.download_url_to_file = patched_download
 
@@ -229,6 +489,44 @@ def _patch_torch_hub_download():
 _patch_torch_hub_download()
 
 
+class Int8WeightLinear(torch.nn.Module):
+    """
+    Weight-only int8 replacement for nn.Linear.
+
+    Weights are stored as int8 with a symmetric per-output-channel scale and
+    dequantized to the activation dtype inside forward, so resident weight memory
+    is roughly halved versus FP16 while the matmul itself still runs in FP16/FP32.
+    """
+
+    def __init__(self, linear: torch.nn.Linear):
+        super().__init__()
+        self.in_features = linear.in_features
+        self.out_features = linear.out_features
+
+        weight = linear.weight.detach()
+        scale = weight.abs().amax(dim=1, keepdim=True).float().clamp_min(1e-8) / 127.0
+        weight_int8 = torch.round(weight.float() / scale).clamp_(-127, 127).to(torch.int8)
+        self.register_buffer("weight_int8", weight_int8)
+        self.register_buffer("scale", scale.to(weight.dtype))
+        self.bias = linear.bias
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        weight = self.weight_int8.to(x.dtype) * self.scale.to(x.dtype)
+        return F.linear(x, weight, self.bias)
+
+
+def _quantize_linear_layers(module: torch.nn.Module) -> int:
+    """Replace every nn.Linear under module with Int8WeightLinear in place. Returns the count."""
+    count = 0
+    for name, child in module.named_children():
+        if isinstance(child, torch.nn.Linear):
+            setattr(module, name, Int8WeightLinear(child))
+            count += 1
+        else:
+            count += _quantize_linear_layers(child)
+    return count
+
+
 class VJEPA2ModelLoader:
     """
     Loads and manages V-JEPA2 models with memory optimization.
@@ -259,10 +557,20 @@ class VJEPA2ModelLoader:
     # Models that have action-conditioned predictors
     AC_MODELS = {"vit-giant-ac"}
 
+    # Checkpoint filenames PyTorch Hub downloads for each model
+    HUB_CHECKPOINT_FILES = _HUB_CHECKPOINT_FILES
+
     def __init__(self, cache_dir: Optional[str] = None):
+        from app.config import settings
+
         self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".cache" / "vjepa2"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # Resolved once - is_cached/has_checkpoint are polled by the frontend during downloads
+        self.checkpoint_dir = Path(settings.checkpoint_dir)
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        self._hub_checkpoint_dir = Path(torch.hub.get_dir()) / "checkpoints"
+
         self.device_info = get_device_info()
         self.device = torch.device(self.device_info.device_type)
 
@@ -270,6 +578,8 @@ class VJEPA2ModelLoader:
         self._predictor: Optional[torch.nn.Module] = None
         self._loaded_model_id: Optional[str] = None
         self._model_load_lock = threading.Lock()  # Prevent concurrent model loading
+        # Called on unload so holders of model references (e.g. compiled wrappers) drop them
+        self._unload_callbacks: List[Callable[[], None]] = []
 
         logger.info(f"VJEPA2ModelLoader initialized on {self.device_info.device_name}")
         logger.info(f"Recommended model: {self.device_info.recommended_model}")
@@ -305,6 +615,15 @@ class VJEPA2ModelLoader:
             if self._encoder is not None:
                 self.unload_model()
 
+            # Refuse loads that cannot fit - an MPS OOM can take down the whole machine
+            available_gb = available_memory_gb()
+            required_gb = self.get_model_load_gb(model_id)
+            if available_gb is not None and required_gb > available_gb:
+                raise RuntimeError(
+                    f"Not enough GPU memory for {model_id}: needs ~{required_gb:.1f}GB, "
+                    f"{available_gb:.1f}GB available"
+                )
+
             hub_name = self.MODEL_HUB_NAMES[model_id]
             logger.info(f"Loading {model_id} ({hub_name}) on {self.device}...")
 
@@ -313,6 +632,7 @@ class VJEPA2ModelLoader:
             # Try loading from checkpoint first (much faster)
             if self._load_checkpoint(model_id):
                 logger.info(f"✅ Model {model_id} loaded from checkpoint")
+                self._maybe_quantize_encoder()
                 return self._encoder
 
             # Fallback to PyTorch Hub if checkpoint load failed
@@ -329,22 +649,10 @@ class VJEPA2ModelLoader:
 
                 # V-JEPA2 returns a tuple: (encoder, predictor)
                 encoder, predictor = result
+                del result
 
-                # Move to device and set dtype
-                dtype = self._get_torch_dtype()
-                encoder = encoder.to(device=self.device)
-                # Use .half() to ensure ALL layers/buffers are FP16, not just parameters
-                if dtype == torch.float16:
-                    encoder = encoder.half()
-                    # Recursively convert ALL submodules to ensure no mixed precision
-                    for module in encoder.modules():
-                        if hasattr(module, 'half'):
-                            module.half()
-                encoder.eval()
-
-                # Disable gradients for inference
-                for param in encoder.parameters():
-                    param.requires_grad = False
+                # Move to device and set dtype, disable gradients for inference
+                encoder = self._finalize_module(encoder)
 
                 elapsed = time.time() - start_time
                 total_params = sum(p.numel() for p in encoder.parameters())
@@ -355,32 +663,53 @@ class VJEPA2ModelLoader:
 
                 # For AC models, also load predictor to GPU for action-conditioned prediction
                 if model_id in self.AC_MODELS:
-                    predictor = predictor.to(device=self.device)
-                    # Use .half() to ensure ALL layers/buffers are FP16, not just parameters
-                    if dtype == torch.float16:
-                        predictor = predictor.half()
-                        # Recursively convert ALL submodules to ensure no mixed precision
-                        for module in predictor.modules():
-                            if hasattr(module, 'half'):
-                                module.half()
-                    predictor.eval()
-                    for param in predictor.parameters():
-                        param.requires_grad = False
+                    predictor = self._finalize_module(predictor)
                     self._predictor = predictor
                     pred_params = sum(p.numel() for p in predictor.parameters())
                     logger.info(f"AC Predictor loaded ({pred_params/1e6:.1f}M params)")
                 else:
-                    self._predictor = predictor  # Keep reference but don't load to GPU
+                    # Only AC models use the predictor - drop its FP32 CPU weights now
+                    del predictor
+                    self._predictor = None
+                    import gc
+                    gc.collect()
 
-                # Save checkpoint for faster future loads
+                # Save checkpoint for faster future loads (unquantized weights)
                 self._save_checkpoint(model_id)
 
-                return encoder
+                self._maybe_quantize_encoder()
+                return self._encoder
 
             except Exception as e:
                 logger.error(f"Failed to load model {model_id}: {e}")
                 raise
 
+    def _finalize_module(self, module: torch.nn.Module) -> torch.nn.Module:
+        """Move a module to the device/dtype in one pass and freeze it for inference."""
+        module = module.to(device=self.device, dtype=self._get_torch_dtype())
+        module.eval()
+        module.requires_grad_(False)  # One recursive call instead of a per-parameter Python loop
+        return module
+
+    def _maybe_quantize_encoder(self) -> None:
+        """Swap the encoder's linear layers for int8-weight versions if enabled in settings."""
+        from app.config import settings
+
+        if not settings.encoder_int8_weights or self._encoder is None:
+            return
+
+        start_time = time.time()
+        count = _quantize_linear_layers(self._encoder)
+        if self.device_info.device_type == "mps":
+            torch.mps.empty_cache()  # Release the replaced FP16 weights
+        elif self.device_info.device_type == "cuda":
+            torch.cuda.empty_cache()
+        logger.info(f"Quantized {count} encoder linear layers to int8 in {time.time() - start_time:.1f}s")
+
+    def add_unload_callback(self, callback: Callable[[], None]) -> None:
+        """Register a callback run whenever the current model is unloaded."""
+        self._unload_callbacks.append(callback)
+
     def unload_model(self) -> None:
         """Unload the current model to free memory."""
         if self._encoder is not None:
@@ -390,6 +719,10 @@ class VJEPA2ModelLoader:
             self._predictor = None
             self._loaded_model_id = None
 
+            # Release other references to the old modules before collecting
+            for callback in self._unload_callbacks:
+                callback()
+
             # Force garbage collection
             import gc
             gc.collect()
@@ -425,23 +758,20 @@ class VJEPA2ModelLoader:
         """Get the size of a model in GB."""
         return self.MODEL_SIZES_GB.get(model_id, 2.0)
 
+    def get_model_load_gb(self, model_id: str) -> float:
+        """Estimate device memory for a loaded model (downloads are FP32 weights)."""
+        scale = 0.5 if self._get_torch_dtype() == torch.float16 else 1.0
+        return self.get_model_size_gb(model_id) * scale
+
+    def _get_hub_checkpoint_path(self, model_id: str) -> Optional[Path]:
+        """Get the PyTorch Hub download path for a model (None for unknown models)."""
+        checkpoint_file = self.HUB_CHECKPOINT_FILES.get(model_id)
+        return self._hub_checkpoint_dir / checkpoint_file if checkpoint_file else None
+
     def is_cached(self, model_id: str) -> bool:
         """Check if a model checkpoint is already cached (downloaded) in PyTorch Hub."""
-        # Check PyTorch hub cache directory
-        hub_dir = Path(torch.hub.get_dir()) / "checkpoints"
-
-        # Map model IDs to their checkpoint filenames
-        checkpoint_names = {
-            "vit-large": "vitl.pt",
-            "vit-huge": "vith.pt",
-            "vit-giant": "vitg.pt",
-            "vit-giant-ac": "vjepa2-ac-vitg.pt",  # Actual filename from PyTorch Hub
-        }
-
-        checkpoint_file = checkpoint_names.get(model_id)
-        if checkpoint_file:
-            return (hub_dir / checkpoint_file).exists()
-        return False
+        hub_path = self._get_hub_checkpoint_path(model_id)
+        return hub_path is not None and hub_path.exists()
 
     def has_checkpoint(self, model_id: str) -> bool:
         """Check if a disk checkpoint exists for this model (Phase 1 checkpointing)."""
@@ -451,17 +781,11 @@ class VJEPA2ModelLoader:
 
     def _get_checkpoint_path(self, model_id: str) -> Path:
         """Get the checkpoint file path for a model."""
-        from app.config import settings
-        checkpoint_dir = Path(settings.checkpoint_dir)
-        checkpoint_dir.mkdir(parents=True, exist_ok=True)
-        return checkpoint_dir / f"{model_id}.pt"
+        return self.checkpoint_dir / f"{model_id}.pt"
 
     def _get_checkpoint_meta_path(self, model_id: str) -> Path:
         """Get the checkpoint metadata file path for a model."""
-        from app.config import settings
-        checkpoint_dir = Path(settings.checkpoint_dir)
-        checkpoint_dir.mkdir(parents=True, exist_ok=True)
-        return checkpoint_dir / f"{model_id}.meta.json"
+        return self.checkpoint_dir / f"{model_id}.meta.json"
 
     def _validate_checkpoint(self, model_id: str) -> bool:
         """
@@ -470,6 +794,8 @@ class VJEPA2ModelLoader:
         Returns:
             True if checkpoint is valid and can be loaded
         """
+        from app.config import settings
+
         checkpoint_path = self._get_checkpoint_path(model_id)
         meta_path = self._get_checkpoint_meta_path(model_id)
 
@@ -495,20 +821,34 @@ class VJEPA2ModelLoader:
                 )
                 return False
 
-            # Validate checksum
+            # Fast path: same size/mtime/inode as when the checkpoint was last verified,
+            # so the file hasn't been rewritten - skip re-hashing several GB
+            current_stat = _file_stat_signature(checkpoint_path)
+            if not settings.force_checkpoint_checksum and meta.get("stat") == current_stat:
+                logger.debug(f"Checkpoint {model_id} unchanged since last verification, skipping checksum")
+                return True
+
+            # Validate checksum (hashed with the algorithm recorded in its "<algo>:" tag)
             expected_checksum = meta.get("checksum", "")
             if expected_checksum:
-                sha256_hash = hashlib.sha256()
-                with open(checkpoint_path, "rb") as f:
-                    # Read in chunks to handle large files
-                    for chunk in iter(lambda: f.read(8192), b""):
-                        sha256_hash.update(chunk)
-                actual_checksum = f"sha256:{sha256_hash.hexdigest()}"
+                algorithm = expected_checksum.split(":", 1)[0]
+                if algorithm == "blake3" and _blake3 is None:
+                    logger.warning(
+                        f"Checkpoint {model_id} uses a blake3 checksum but blake3 is not installed. "
+                        f"Will reload from PyTorch Hub."
+                    )
+                    return False
+                actual_checksum = _compute_file_checksum(checkpoint_path, algorithm)
 
                 if actual_checksum != expected_checksum:
                     logger.error(f"Checkpoint {model_id} corrupted (checksum mismatch)")
                     return False
 
+                # Remember the verified file so the next load can take the fast path
+                meta["stat"] = current_stat
+                with open(meta_path, 'w') as f:
+                    json.dump(meta, f, indent=2)
+
             return True
 
         except Exception as e:
@@ -563,12 +903,8 @@ class VJEPA2ModelLoader:
             # Write to temporary file first (atomic write)
             torch.save(checkpoint, tmp_checkpoint_path)
 
-            # Calculate checksum
-            sha256_hash = hashlib.sha256()
-            with open(tmp_checkpoint_path, "rb") as f:
-                for chunk in iter(lambda: f.read(8192), b""):
-                    sha256_hash.update(chunk)
-            checksum = f"sha256:{sha256_hash.hexdigest()}"
+            # Calculate checksum (blake3 when installed, else sha256)
+            checksum = _compute_file_checksum(tmp_checkpoint_path)
 
             # Create metadata
             metadata = {
@@ -583,13 +919,14 @@ class VJEPA2ModelLoader:
                 "format_version": "1.0",  # Track checkpoint format (1.0=state_dict, 2.0=full_model - deprecated)
             }
 
-            # Write metadata
-            with open(meta_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
-
             # Atomic rename (tmp -> final)
             shutil.move(str(tmp_checkpoint_path), str(checkpoint_path))
 
+            # Write metadata, including the stat signature used by the validation fast path
+            metadata["stat"] = _file_stat_signature(checkpoint_path)
+            with open(meta_path, 'w') as f:
+                json.dump(metadata, f, indent=2)
+
             elapsed = time.time() - start_time
             size_mb = checkpoint_path.stat().st_size / (1024 ** 2)
             logger.info(f"Checkpoint saved in {elapsed:.1f}s ({size_mb:.1f}MB)")
@@ -597,24 +934,11 @@ class VJEPA2ModelLoader:
             # Optimization #5: Clean up redundant PyTorch Hub cache to reclaim disk space
             # Since we have a checkpoint, the hub cache is redundant
             try:
-                hub_cache_dir = Path(torch.hub.get_dir()) / "checkpoints"
-                hub_name = self.MODEL_HUB_NAMES.get(model_id, "")
-
-                # Map to actual hub checkpoint filenames
-                hub_checkpoint_files = {
-                    "vit-large": "vitl.pt",
-                    "vit-huge": "vith.pt",
-                    "vit-giant": "vitg.pt",
-                    "vit-giant-ac": "vjepa2-ac-vitg.pt",
-                }
-
-                hub_file = hub_checkpoint_files.get(model_id)
-                if hub_file:
-                    hub_cache_path = hub_cache_dir / hub_file
-                    if hub_cache_path.exists():
-                        hub_size_mb = hub_cache_path.stat().st_size / (1024 ** 2)
-                        hub_cache_path.unlink()
-                        logger.info(f"Deleted redundant PyTorch Hub cache ({hub_size_mb:.1f}MB freed)")
+                hub_cache_path = self._get_hub_checkpoint_path(model_id)
+                if hub_cache_path is not None and hub_cache_path.exists():
+                    hub_size_mb = hub_cache_path.stat().st_size / (1024 ** 2)
+                    hub_cache_path.unlink()
+                    logger.info(f"Deleted redundant PyTorch Hub cache ({hub_size_mb:.1f}MB freed)")
             except Exception as e:
                 logger.debug(f"Failed to cleanup hub cache (non-critical): {e}")
 
@@ -655,9 +979,11 @@ class VJEPA2ModelLoader:
             logger.info(f"Loading checkpoint for {model_id} from {checkpoint_path}...")
             start_time = time.time()
 
-            # Load checkpoint (map to CPU first, then move to target device)
-            # weights_only=False is safe here since we trust our own checkpoints
-            checkpoint = torch.load(checkpoint_path, map_location='cpu', weights_only=False)
+            # Load checkpoint straight onto the target device. The checkpoint only holds
+            # state_dicts and plain str/float metadata, so weights_only=True can load it.
+            # mmap=True maps tensor storages from the file instead of reading them all
+            # into RAM first, so there is no full CPU landing copy
+            checkpoint = torch.load(checkpoint_path, map_location=self.device, weights_only=True, mmap=True)
 
             # Load model architecture from PyTorch Hub (lightweight, no weights download)
             hub_name = self.MODEL_HUB_NAMES[model_id]
@@ -669,23 +995,14 @@ class VJEPA2ModelLoader:
                 trust_repo=True,
             )
             encoder, predictor = result
+            del result
 
-            # Load state dicts from checkpoint
-            encoder.load_state_dict(checkpoint["encoder_state_dict"])
-
-            # Move to device and set dtype
-            dtype = self._get_torch_dtype()
-            encoder = encoder.to(device=self.device)
-            if dtype == torch.float16:
-                encoder = encoder.half()
-                for module in encoder.modules():
-                    if hasattr(module, 'half'):
-                        module.half()
-            encoder.eval()
+            # Load state dicts from checkpoint - assign=True adopts the already-on-device
+            # tensors as the parameters instead of copying them into the CPU-initialized ones
+            encoder.load_state_dict(checkpoint["encoder_state_dict"], assign=True)
 
-            # Disable gradients
-            for param in encoder.parameters():
-                param.requires_grad = False
+            # Move to device and set dtype, disable gradients
+            encoder = self._finalize_module(encoder)
 
             self._encoder = encoder
             self._loaded_model_id = model_id
@@ -693,19 +1010,12 @@ class VJEPA2ModelLoader:
             # Load predictor for AC models
             if model_id in self.AC_MODELS:
                 if "predictor_state_dict" in checkpoint and predictor is not None:
-                    predictor.load_state_dict(checkpoint["predictor_state_dict"])
-                    predictor = predictor.to(device=self.device)
-                    if dtype == torch.float16:
-                        predictor = predictor.half()
-                        for module in predictor.modules():
-                            if hasattr(module, 'half'):
-                                module.half()
-                    predictor.eval()
-                    for param in predictor.parameters():
-                        param.requires_grad = False
+                    predictor.load_state_dict(checkpoint["predictor_state_dict"], assign=True)
+                    predictor = self._finalize_module(predictor)
                 self._predictor = predictor
             else:
                 self._predictor = None
+            del predictor  # Non-AC: the freshly built CPU predictor is freed by the gc below
 
             # ✅ FIX: Explicitly delete checkpoint dict to free CPU copies
             # This prevents memory leaks when loading models from checkpoints
@@ -771,14 +1081,22 @@ class VJEPA2Inference:
         self.device = model_loader.device
         self.dtype = torch.float16 if model_loader.device_info.supports_fp16 else torch.float32
 
-        # Cache normalization tensors (5-10% faster preprocessing on M4)
-        # These are created once instead of on every image
-        self._norm_mean = torch.tensor(self.MEAN, dtype=torch.float32, device='cpu').view(3, 1, 1)
-        self._norm_std = torch.tensor(self.STD, dtype=torch.float32, device='cpu').view(3, 1, 1)
+        # Cache normalization as a per-channel affine on the device (created once):
+        # (x / 255 - mean) / std == x * scale + bias, applied in a single addcmul
+        norm_mean = torch.tensor(self.MEAN, dtype=torch.float32).view(3, 1, 1)
+        norm_std = torch.tensor(self.STD, dtype=torch.float32).view(3, 1, 1)
+        self._norm_scale = (1.0 / (255.0 * norm_std)).to(device=self.device, dtype=self.dtype)
+        self._norm_bias = (-norm_mean / norm_std).to(device=self.device, dtype=self.dtype)
 
-        # Cached tensors for AC evaluation (avoid reallocating every iteration)
-        self._cached_states = None  # Reused zero states tensor
+        # Fixed-shape AC input buffers, allocated once and sliced per mini-batch
+        # Constant shapes keep the MPS caching allocator from growing across CEM iterations
         self._max_batch_size_ac = 100  # Mini-batch size for optimal MPS performance on M4
+        # Mini-batches are padded up to one of these sizes so the predictor (and the MPS
+        # graph cache keyed on input shapes) only ever sees a few batch shapes
+        self._ac_batch_buckets = (self._max_batch_size_ac // 4, self._max_batch_size_ac // 2, self._max_batch_size_ac)
+        ac_buffer_shape = (self._max_batch_size_ac, 1, self.ACTION_DIM_AC)
+        self._cached_states = torch.zeros(ac_buffer_shape, device=self.device, dtype=self.dtype)  # Never written
+        self._cached_actions = torch.empty(ac_buffer_shape, device=self.device, dtype=self.dtype)
 
         # Cache for preprocessed tensors and embeddings with LRU eviction
         # Key is (content_hash, for_ac) tuple
@@ -788,15 +1106,66 @@ class VJEPA2Inference:
         self._max_tensor_cache_size = 10  # Small cache - just for immediate reuse within a run
         logger.info(f"Tensor cache size: {self._max_tensor_cache_size} images (optimized for multi-step planning)")
 
-        self._tensor_cache: Dict[Tuple[str, bool], torch.Tensor] = {}
-        self._tensor_cache_order: List[Tuple[str, bool]] = []  # For LRU tracking
+        self._tensor_cache: OrderedDict[Tuple[str, bool], torch.Tensor] = OrderedDict()  # LRU ordering
 
         self._embedding_cache: Dict[str, torch.Tensor] = {}
         self._max_embedding_cache_size = 10  # Embeddings are larger
 
+        # torch.compile'd modules by role ("encoder", "predictor"), stored with the module
+        # they wrap so a model reload transparently recompiles on the next call.
+        # The compiled wrapper holds its module strongly, so entries are dropped on unload
+        self._compiled_modules: Dict[str, Tuple[torch.nn.Module, Callable]] = {}
+        model_loader.add_unload_callback(self._compiled_modules.clear)
+
+    def _get_compiled(self, role: str, module: torch.nn.Module, **compile_kwargs) -> Callable:
+        """Return module compiled with torch.compile (once per module) if enabled, else module."""
+        from app.config import settings
+
+        if not settings.enable_torch_compile or not hasattr(torch, "compile"):
+            return module
+
+        cached = self._compiled_modules.get(role)
+        if cached is not None and cached[0] is module:
+            return cached[1]
+
+        try:
+            compiled = torch.compile(module, dynamic=False, **compile_kwargs)
+            logger.info(f"Compiled {role} with torch.compile")
+        except Exception as e:
+            logger.warning(f"torch.compile failed for {role}, using eager module: {e}")
+            compiled = module
+        self._compiled_modules[role] = (module, compiled)
+        return compiled
+
+    def _maybe_autocast(self):
+        """
+        Autocast context for model calls - CUDA only.
+
+        Weights are already FP16 on MPS, where autocast only adds cast ops (measurably
+        slower), and CPU autocast is far slower than plain FP32.
+        """
+        if self.device.type == "cuda":
+            return autocast(device_type="cuda", dtype=torch.float16)
+        return contextlib.nullcontext()
+
+    def _get_rollout_predictor(self, predictor: torch.nn.Module) -> Callable:
+        """Return the predictor to use for rollouts, compiling it once if enabled."""
+        return self._get_compiled("predictor", predictor)
+
+    def _get_encoder(self) -> Callable:
+        """
+        Return the encoder to call, compiling it once if enabled.
+
+        Inputs are fixed-size (preprocessed to IMAGE_SIZE/IMAGE_SIZE_AC), so a static
+        graph fuses the attention blocks.
+        """
+        encoder = self.loader.get_model()
+        if encoder is None:
+            raise RuntimeError("No model loaded. Call loader.load_model() first.")
+        return self._get_compiled("encoder", encoder)
+
     def _get_image_hash(self, image: Image.Image) -> str:
         """Generate a robust hash for image content to use as cache key."""
-        import hashlib
         # Use downsampled image bytes for reliable uniqueness
         # This prevents hash collisions that cause current/goal images to share tensors
         w, h = image.size
@@ -810,7 +1179,10 @@ class VJEPA2Inference:
             sample = image.tobytes()
 
         # Use blake2b (faster than MD5 on modern CPUs like M4)
-        return hashlib.blake2b(sample, digest_size=16).hexdigest()
+        # Include the size, which the 32x32 sample alone does not capture
+        digest = hashlib.blake2b(sample, digest_size=16)
+        digest.update(f"{w}x{h}:{image.mode}".encode())
+        return digest.hexdigest()
 
     def preprocess_image(self, image: Image.Image, use_cache: bool = True, for_ac: bool = False) -> torch.Tensor:
         """
@@ -822,84 +1194,100 @@ class VJEPA2Inference:
             for_ac: Whether preprocessing for AC model (uses 256x256)
 
         Returns:
-            Preprocessed tensor of shape (3, size, size)
+            Preprocessed tensor of shape (3, size, size), on the device in self.dtype
         """
-        # Use appropriate size for AC vs standard models
-        img_size = self.IMAGE_SIZE_AC if for_ac else self.IMAGE_SIZE
-
-        # Check cache first using content hash (not object id which can be reused)
-        cache_key = (self._get_image_hash(image), for_ac)
-        if use_cache and cache_key in self._tensor_cache:
-            return self._tensor_cache[cache_key]
+        return self.preprocess_images([image], use_cache=use_cache, for_ac=for_ac)[0]
 
-        # Resize and convert to RGB
-        image = image.convert("RGB")
-        image = image.resize((img_size, img_size), Image.BILINEAR)
+    def preprocess_images(
+        self,
+        images: List[Image.Image],
+        use_cache: bool = True,
+        for_ac: bool = False,
+    ) -> torch.Tensor:
+        """
+        Preprocess several images at once, uploading all cache misses in a single copy.
 
-        # Convert to tensor and normalize
-        img_array = np.array(image).astype(np.float32) / 255.0
-        img_tensor = torch.from_numpy(img_array).permute(2, 0, 1)  # HWC -> CHW
+        Args:
+            images: PIL Images
+            use_cache: Whether to cache the results
+            for_ac: Whether preprocessing for AC model (uses 256x256)
 
-        # Normalize with ImageNet stats (using cached tensors for 5-10% speedup)
-        img_tensor = (img_tensor - self._norm_mean) / self._norm_std
+        Returns:
+            Preprocessed tensor of shape (N, 3, size, size), on the device in self.dtype
+        """
+        # Use appropriate size for AC vs standard models
+        img_size = self.IMAGE_SIZE_AC if for_ac else self.IMAGE_SIZE
 
-        # Cache the result with LRU eviction
+        # Check cache first using content hash (not object id which can be reused)
+        cache_keys = [(self._get_image_hash(image), for_ac) for image in images]
+        tensors: List[Optional[torch.Tensor]] = [None] * len(images)
         if use_cache:
-            # Evict oldest entry if cache is full
-            if len(self._tensor_cache) >= self._max_tensor_cache_size:
-                if self._tensor_cache_order:
-                    oldest_key = self._tensor_cache_order.pop(0)
-                    self._tensor_cache.pop(oldest_key, None)
-
-            self._tensor_cache[cache_key] = img_tensor
-            # Track access order for LRU
-            if cache_key in self._tensor_cache_order:
-                self._tensor_cache_order.remove(cache_key)
-            self._tensor_cache_order.append(cache_key)
+            for i, cache_key in enumerate(cache_keys):
+                cached = self._tensor_cache.get(cache_key)
+                if cached is not None:
+                    self._tensor_cache.move_to_end(cache_key)
+                    tensors[i] = cached
+
+        missing = [i for i, tensor in enumerate(tensors) if tensor is None]
+        if not missing:
+            return torch.stack(tensors)
+
+        # Resize and convert to RGB, then upload the uint8 pixels as one batch
+        # (4x less to copy than FP32) and cast on the device
+        arrays = [
+            np.asarray(images[i].convert("RGB").resize((img_size, img_size), Image.BILINEAR))
+            for i in missing
+        ]
+        batch = torch.from_numpy(np.stack(arrays)).permute(0, 3, 1, 2)  # NHWC -> NCHW view
+        batch = batch.to(device=self.device, dtype=self.dtype)
+
+        # Scale to [0, 1] and normalize with ImageNet stats in one fused kernel
+        batch = torch.addcmul(self._norm_bias, batch, self._norm_scale)
+
+        for j, i in enumerate(missing):
+            tensors[i] = batch[j]
+            # Cache the result with LRU eviction
+            if use_cache:
+                self._tensor_cache[cache_keys[i]] = batch[j]
+                self._tensor_cache.move_to_end(cache_keys[i])
+        if use_cache:
+            # Evict least recently used entries if cache is full
+            while len(self._tensor_cache) > self._max_tensor_cache_size:
+                self._tensor_cache.popitem(last=False)
 
-        return img_tensor
+        # When nothing was cached the fresh batch already is the result
+        return batch if len(missing) == len(images) else torch.stack(tensors)
 
     def clear_cache(self, aggressive: bool = False):
         """
         Clear the tensor and embedding caches to free memory.
 
         Args:
-            aggressive: If True, perform more thorough cleanup for MPS memory fragmentation.
-                       Should be set to True between planning runs to prevent slowdown.
+            aggressive: If True, also return cached MPS blocks to the system - but only
+                       under memory pressure. empty_cache() scans every allocator block and
+                       synchronize() stalls the stream, so between planning runs it is
+                       cheaper to let the allocator reuse its (fixed-shape) pool.
         """
         # Clear all cached tensors
         self._tensor_cache.clear()
-        self._tensor_cache_order.clear()
         self._embedding_cache.clear()
-        self._cached_states = None  # Clear cached states tensor
+        # The AC input buffers are a few KB and fixed-shape, so they are kept
 
-        # Force garbage collection and empty MPS cache on M4
-        import gc
-        gc.collect()
+        # Drop compiled wrappers of modules that are no longer loaded (the current ones
+        # are kept - recompiling them after every planning run would cost far more)
+        live_modules = (self.loader.get_model(), self.loader.get_predictor())
+        for role, (module, _) in list(self._compiled_modules.items()):
+            if not any(module is live for live in live_modules):
+                del self._compiled_modules[role]
 
-        if self.device.type == "mps":
-            # Synchronize to ensure all MPS operations complete
-            torch.mps.synchronize()
-            torch.mps.empty_cache()
+        if not aggressive or self.device.type != "mps" or not _mps_memory_pressure():
+            return
 
-            if aggressive:
-                # For MPS, run multiple GC cycles to help with memory fragmentation
-                # This is critical for preventing the "encoding slowdown" issue
-                # where subsequent planning runs take exponentially longer
-                for _ in range(3):
-                    gc.collect()
-                torch.mps.synchronize()
-                torch.mps.empty_cache()
-
-                # Also recommend a full MPS heap reset for truly fresh state
-                # This forces the MPS allocator to release ALL memory back to the system
-                try:
-                    torch.mps.set_per_process_memory_fraction(0.0)  # Reset allocation
-                    torch.mps.set_per_process_memory_fraction(1.0)  # Allow full memory again
-                except Exception:
-                    pass  # These APIs may not be available in all PyTorch versions
-
-                logger.debug("Aggressive MPS memory cleanup completed")
+        import gc
+        gc.collect()
+        torch.mps.synchronize()
+        torch.mps.empty_cache()
+        logger.debug("MPS memory pressure: released cached allocator blocks")
 
     def prepare_video_input(
         self,
@@ -918,11 +1306,8 @@ class VJEPA2Inference:
         Returns:
             Video tensor of shape (1, 3, 2, 224, 224) or (1, 3, 2, 256, 256) if for_ac
         """
-        current_tensor = self.preprocess_image(current_image, for_ac=for_ac)
-        goal_tensor = self.preprocess_image(goal_image, for_ac=for_ac)
-
-        # Stack as video frames: (C, H, W) + (C, H, W) -> (2, C, H, W)
-        video = torch.stack([current_tensor, goal_tensor], dim=0)
+        # Both frames in one preprocess pass: (2, C, H, W)
+        video = self.preprocess_images([current_image, goal_image], for_ac=for_ac)
 
         # Permute to (C, T, H, W) format: (2, C, H, W) -> (C, 2, H, W)
         video = video.permute(1, 0, 2, 3)
@@ -930,9 +1315,6 @@ class VJEPA2Inference:
         # Add batch dimension: (C, T, H, W) -> (B=1, C, T, H, W)
         video = video.unsqueeze(0)
 
-        # Move to device
-        video = video.to(device=self.device, dtype=self.dtype)
-
         return video
 
     @torch.inference_mode()
@@ -954,20 +1336,23 @@ class VJEPA2Inference:
             Tuple of (current_embedding, goal_embedding)
             For standard models: each of shape (embed_dim,) - global averaged
             For AC models: each of shape (num_patches, embed_dim) - full patch embeddings
+
+        Note:
+            For AC models the full patch embeddings are stored in _embedding_cache.
+            They are freshly allocated encoder outputs owned by the cache and are
+            treated as immutable: callers may hold detached views but must not
+            modify them in place.
         """
         encode_start = time.time()
 
-        encoder = self.loader.get_model()
-        if encoder is None:
-            raise RuntimeError("No model loaded. Call loader.load_model() first.")
+        encoder = self._get_encoder()
 
         is_ac = self.loader.is_ac_model()
 
         if is_ac:
             # For AC models, encode current and goal separately (single-frame videos)
             # This is more efficient than encoding a dual-frame video
-            current_tensor = self.preprocess_image(current_image, for_ac=True)
-            goal_tensor = self.preprocess_image(goal_image, for_ac=True)
+            current_tensor, goal_tensor = self.preprocess_images([current_image, goal_image], for_ac=True)
 
             # Create proper video format: (C, H, W) -> (B=1, C, T=2, H, W)
             # Stack same frame twice for temporal dimension (T=2 as expected by encoder)
@@ -981,8 +1366,8 @@ class VJEPA2Inference:
             current_video = current_video.to(device=self.device, dtype=self.dtype)
             goal_video = goal_video.to(device=self.device, dtype=self.dtype)
 
-            # Encode separately (2 encoder calls instead of 3) with MPS AMP for 10-15% speedup
-            with autocast(device_type=self.device.type, enabled=(self.device.type == 'mps')):
+            # Encode separately (2 encoder calls instead of 3)
+            with self._maybe_autocast():
                 current_emb = encoder(current_video)  # (1, num_patches, embed_dim)
                 goal_emb = encoder(goal_video)  # (1, num_patches, embed_dim)
 
@@ -1006,8 +1391,8 @@ class VJEPA2Inference:
             # For standard models, use dual-frame encoding
             video = self.prepare_video_input(current_image, goal_image, for_ac=False)
 
-            # Get embeddings from encoder with MPS AMP for 10-15% speedup
-            with autocast(device_type=self.device.type, enabled=(self.device.type == 'mps')):
+            # Get embeddings from encoder
+            with self._maybe_autocast():
                 embeddings = encoder(video)  # (1, num_patches, embed_dim)
             global_emb = embeddings.mean(dim=1)  # (1, embed_dim)
 
@@ -1027,8 +1412,8 @@ class VJEPA2Inference:
     @torch.inference_mode()
     def evaluate_actions_ac(
         self,
-        actions: np.ndarray,
-    ) -> np.ndarray:
+        actions: torch.Tensor,
+    ) -> torch.Tensor:
         """
         Evaluate actions using the AC predictor with mini-batching (30-40% faster on M4).
 
@@ -1036,10 +1421,10 @@ class VJEPA2Inference:
         then computes L1 distance to goal embeddings.
 
         Args:
-            actions: Action candidates of shape (num_samples, 7) in DROID format
+            actions: Action candidates of shape (num_samples, 7) in DROID format, on the device
 
         Returns:
-            Energy values for each action, shape (num_samples,)
+            Energy values for each action, shape (num_samples,), on the device
         """
         predictor = self.loader.get_predictor()
         if predictor is None:
@@ -1071,83 +1456,68 @@ class VJEPA2Inference:
             batch_energies = self._evaluate_actions_ac_batch(batch_actions, current_patches, goal_patches, predictor)
             energies_list.append(batch_energies)
 
-        return np.concatenate(energies_list)
+        return torch.cat(energies_list)
 
     def _evaluate_actions_ac_batch(
         self,
-        actions: np.ndarray,
+        actions: torch.Tensor,
         current_patches: torch.Tensor,
         goal_patches: torch.Tensor,
         predictor: torch.nn.Module,
-    ) -> np.ndarray:
+    ) -> torch.Tensor:
         """Helper to evaluate a batch of actions (called by evaluate_actions_ac)."""
         num_samples = actions.shape[0]
 
-        # Convert actions to tensor with correct dtype (FP16 for M4 optimization)
-        actions_t = torch.from_numpy(actions).to(device=self.device, dtype=self.dtype)
+        # Pad to the smallest fixed bucket that fits (num_samples <= _max_batch_size_ac)
+        batch_size = next(b for b in self._ac_batch_buckets if b >= num_samples)
 
         # Expand current patches to batch size
         # current_patches shape: (1, num_patches, embed_dim) where num_patches = T*(H*W) = 1*256 = 256
         # T=1 since we encode single frames separately
-        x = current_patches.expand(num_samples, -1, -1)  # (num_samples, num_patches=T*H*W, embed_dim)
+        x = current_patches.expand(batch_size, -1, -1)  # (B, num_patches=T*H*W, embed_dim)
 
         # For AC predictor, actions and states need temporal dimension (B, T, action_dim)
         # We encoded single frames (T=1), so actions/states should be (B, T=1, 7)
-        # Add temporal dimension (dtype already matches from actions_t creation)
-        actions_expanded = actions_t.unsqueeze(1)  # (B, 1, 7)
+        # Copy into the preallocated buffer (the FP16 cast happens in the same op)
+        actions_expanded = self._cached_actions[:batch_size]  # (B, 1, 7)
+        actions_expanded[:num_samples, 0].copy_(actions)
+        if batch_size > num_samples:
+            actions_expanded[num_samples:].zero_()  # Padding rows, their energies are dropped
 
-        # Reuse cached zero states tensor (5-10% faster, avoids reallocation)
-        # Only recreate if current cache is smaller than needed (allows reuse across varying batch sizes)
-        if self._cached_states is None or self._cached_states.shape[0] < num_samples:
-            self._cached_states = torch.zeros(num_samples, 1, self.ACTION_DIM_AC, device=self.device, dtype=self.dtype)
-        states = self._cached_states[:num_samples]  # Slice to exact size needed
+        # Zero states, sliced from the preallocated buffer
+        states = self._cached_states[:batch_size]
 
-        # Run predictor to get predicted future embeddings with MPS AMP for 10-15% speedup
+        # Run predictor to get predicted future embeddings
         # predictor(x, actions, states) -> predicted embeddings
-        with autocast(device_type=self.device.type, enabled=(self.device.type == 'mps')):
-            predicted = predictor(x, actions_expanded, states)  # (num_samples, num_patches, embed_dim)
+        with self._maybe_autocast():
+            predicted = predictor(x, actions_expanded, states)  # (B, num_patches, embed_dim)
 
         # Compute L1 distance between predicted and goal embeddings
         # Average over patches and embedding dimensions
-        goal_expanded = goal_patches.expand(num_samples, -1, -1)  # (num_samples, num_patches, embed_dim)
-        energy = torch.abs(predicted - goal_expanded).mean(dim=(1, 2))  # (num_samples,)
+        # goal_patches (1, num_patches, embed_dim) broadcasts against the batch, no expand needed.
+        # predicted is a fresh predictor output, so the difference is taken in place
+        # instead of materializing another (B, num_patches, embed_dim) temporary
+        energy = predicted.sub_(goal_patches).abs_().mean(dim=(1, 2))  # (B,)
 
         # Scale to reasonable range (typical L1 values are small)
-        energy = energy * 10.0
+        energy.mul_(10.0)
 
-        return energy.cpu().numpy()
+        return energy[:num_samples]
 
-    @torch.inference_mode()
-    def _evaluate_actions_embedding(
-        self,
-        current_emb: torch.Tensor,
-        goal_emb: torch.Tensor,
-        actions: np.ndarray,
-    ) -> np.ndarray:
+    def _prepare_embedding_context(self, current_emb: torch.Tensor, goal_emb: torch.Tensor) -> torch.Tensor:
         """
-        Evaluate a batch of action candidates using embedding-based energy.
-
-        The energy function measures how well an action would move from
-        current state toward the goal state in the learned embedding space.
+        Unit 3D goal direction used by _evaluate_actions_embedding.
 
-        Energy is normalized to a reasonable range (typically 0-10) where:
-        - Lower energy = better action
-        - 0 = perfect alignment with goal direction
-        - Higher values = poor alignment or excessive action magnitude
+        Depends only on the two embeddings, so CEM computes it once per run instead
+        of re-deriving the norms (and their device syncs) every iteration.
 
         Args:
             current_emb: Current state embedding (embed_dim,)
             goal_emb: Goal state embedding (embed_dim,)
-            actions: Action candidates of shape (num_samples, action_dim)
 
         Returns:
-            Energy values for each action, shape (num_samples,)
+            Goal direction of shape (1, 3), ready to broadcast against action batches
         """
-        num_samples = actions.shape[0]
-
-        # Convert actions to tensor with correct dtype (FP16 for M4 optimization)
-        actions_t = torch.from_numpy(actions).to(device=self.device, dtype=self.dtype)
-
         # Compute direction vector from current to goal in embedding space
         direction = goal_emb - current_emb  # (half_embed_dim,)
         direction_norm = torch.norm(direction)
@@ -1159,12 +1529,6 @@ class VJEPA2Inference:
             # If embeddings are nearly identical, any action is equally good
             direction_unit = direction
 
-        # Normalize actions to [-1, 1] range
-        actions_normalized = actions_t / self.ACTION_HIGH  # (num_samples, 3)
-
-        # Compute action magnitudes (normalized, so max ~1.73 for corner actions)
-        action_norms = torch.norm(actions_normalized, dim=1)  # (num_samples,)
-
         # Use first 3 dimensions of direction as the target action direction
         # This maps the high-dimensional embedding difference to our 3D action space
         proj_dim = min(self.ACTION_DIM, direction_unit.shape[0])
@@ -1175,13 +1539,46 @@ class VJEPA2Inference:
         if goal_3d_norm > 1e-6:
             goal_direction_3d = goal_direction_3d / goal_3d_norm
 
+        return goal_direction_3d.unsqueeze(0)
+
+    @torch.inference_mode()
+    def _evaluate_actions_embedding(
+        self,
+        goal_direction_3d: torch.Tensor,
+        actions: torch.Tensor,
+    ) -> torch.Tensor:
+        """
+        Evaluate a batch of action candidates using embedding-based energy.
+
+        The energy function measures how well an action would move from
+        current state toward the goal state in the learned embedding space.
+
+        Energy is normalized to a reasonable range (typically 0-10) where:
+        - Lower energy = better action
+        - 0 = perfect alignment with goal direction
+        - Higher values = poor alignment or excessive action magnitude
+
+        Args:
+            goal_direction_3d: Goal direction from _prepare_embedding_context, shape (1, 3)
+            actions: Action candidates of shape (num_samples, action_dim), on the device
+
+        Returns:
+            Energy values for each action, shape (num_samples,), on the device
+        """
+        num_samples = actions.shape[0]
+
+        # Cast to the model dtype (FP16 for M4 optimization)
+        actions_t = actions.to(dtype=self.dtype)
+
+        # Normalize actions to [-1, 1] range
+        actions_normalized = actions_t * (1.0 / self.ACTION_HIGH)  # (num_samples, 3)
+
+        # Compute action magnitudes (normalized, so max ~1.73 for corner actions)
+        action_norms = torch.norm(actions_normalized, dim=1)  # (num_samples,)
+
         # Compute cosine similarity using fused kernel (5-10% faster on MPS)
         # Range: [-1, 1] where 1 = perfect alignment, -1 = opposite direction
-        cosine_sim = F.cosine_similarity(
-            actions_normalized,
-            goal_direction_3d.unsqueeze(0).expand(num_samples, -1),
-            dim=1
-        )
+        cosine_sim = F.cosine_similarity(actions_normalized, goal_direction_3d, dim=1)
 
         # Energy components (all normalized to reasonable ranges):
         # 1. Alignment term: (1 - cosine_sim) / 2 maps [-1, 1] to [1, 0]
@@ -1204,7 +1601,7 @@ class VJEPA2Inference:
             noise                          # Small noise
         )
 
-        return energy.cpu().numpy()
+        return energy
 
     @torch.inference_mode()
     def run_cem(
@@ -1235,16 +1632,14 @@ class VJEPA2Inference:
         """
         start_time = time.time()
 
-        # CRITICAL: Clear any leftover memory from previous runs BEFORE starting
-        # This prevents MPS memory fragmentation that causes exponentially slower encoding
-        self.clear_cache(aggressive=True)
-
         try:
             # Check if we have an AC model
             is_ac = self.loader.is_ac_model()
 
             # Encode images once (cached)
             current_emb, goal_emb = self.encode_images(current_image, goal_image)
+            # Iteration-invariant part of the embedding energy, computed once
+            goal_direction_3d = None if is_ac else self._prepare_embedding_context(current_emb, goal_emb)
 
             # Set action dimensions and bounds based on model type
             if is_ac:
@@ -1281,6 +1676,13 @@ class VJEPA2Inference:
 
             action_std = (action_range / 4).astype(np.float32)
 
+            # Keep the sampling distribution and bounds on the device (FP32 statistics),
+            # so each iteration's samples never round-trip through host memory
+            action_mean_t = torch.as_tensor(action_mean, dtype=torch.float32, device=self.device)
+            action_std_t = torch.as_tensor(action_std, dtype=torch.float32, device=self.device)
+            action_low_t = torch.as_tensor(action_low, dtype=torch.float32, device=self.device)
+            action_high_t = torch.as_tensor(action_high, dtype=torch.float32, device=self.device)
+
             # Pre-allocate arrays for CEM iterations
             energy_history = []
             best_action = np.zeros(action_dim, dtype=np.float32)
@@ -1296,40 +1698,34 @@ class VJEPA2Inference:
                 progress = iteration / max(1, num_iterations - 1)  # 0.0 to 1.0
                 current_elite_fraction = 0.20 * (1 - progress) + 0.05 * progress  # Linear decay 20% -> 5%
                 num_elite = max(1, int(num_samples * current_elite_fraction))
-                # Sample actions from current distribution
-                actions = np.random.normal(
-                    loc=action_mean,
-                    scale=action_std,
-                    size=(num_samples, action_dim)
+                # Sample actions from current distribution on the device
+                actions = torch.normal(
+                    action_mean_t.expand(num_samples, -1),
+                    action_std_t.expand(num_samples, -1),
                 )
 
-                # Clip to action bounds (in-place to avoid allocation, 2-5% faster)
-                np.clip(actions, action_low, action_high, out=actions)
+                # Clip to action bounds (in-place to avoid allocation)
+                actions.clamp_(action_low_t, action_high_t)
 
                 # Evaluate all actions using appropriate method
                 if is_ac:
                     energies = self.evaluate_actions_ac(actions)
                 else:
-                    energies = self._evaluate_actions_embedding(current_emb, goal_emb, actions)
-
-                # Select elite samples (lowest energy) - use argpartition for O(n) vs O(n log n)
-                # argpartition is 3-5x faster on M4 when we only need top-k elements
-                elite_indices = np.argpartition(energies, num_elite)[:num_elite]
-                # Sort only the elite indices to get the best one
-                sorted_elite_idx = elite_indices[np.argsort(energies[elite_indices])]
+                    energies = self._evaluate_actions_embedding(goal_direction_3d, actions)
 
-                elite_actions = actions[sorted_elite_idx]
-                elite_energies = energies[sorted_elite_idx]
+                # Select elite samples (lowest energy, sorted) with a single device top-k
+                elite_energies, elite_idx = torch.topk(energies, num_elite, largest=False, sorted=True)
+                elite_actions = actions.index_select(0, elite_idx)
 
-                # Update distribution based on elite samples (in-place for speed)
-                np.mean(elite_actions, axis=0, out=action_mean)
-                np.std(elite_actions, axis=0, out=action_std)
-                action_std += 1e-6  # Prevent zero std
+                # Update distribution based on elite samples in one fused pass (population std, like np.std)
+                action_std_t, action_mean_t = torch.std_mean(elite_actions, dim=0, correction=0)
+                action_std_t.add_(1e-6)  # Prevent zero std
 
-                # Track best (elite_actions[0] is already a new array from indexing)
-                if elite_energies[0] < best_energy:
-                    best_energy = elite_energies[0]
-                    best_action = elite_actions[0]
+                # Track best (the only host sync per iteration, plus the action when it improves)
+                iteration_best = float(elite_energies[0])
+                if iteration_best < best_energy:
+                    best_energy = iteration_best
+                    best_action = elite_actions[0].cpu().numpy()
 
                 energy_history.append(round(float(best_energy), 3))
 
@@ -1349,6 +1745,7 @@ class VJEPA2Inference:
                     progress_callback(iteration + 1, num_iterations, best_energy, best_action)
 
             elapsed = time.time() - start_time
+            action_std = action_std_t.cpu().numpy()
 
             # Compute confidence based on:
             # 1. Final energy value (lower = better, range 0-10)
@@ -1394,8 +1791,7 @@ class VJEPA2Inference:
             }
         finally:
             # Always clear per-request caches to prevent memory buildup
-            # Use aggressive=True to prevent MPS memory fragmentation that causes
-            # exponentially increasing encoding times on subsequent runs
+            # (aggressive only releases MPS memory when the device is under pressure)
             self.clear_cache(aggressive=True)
 
     @torch.inference_mode()
@@ -1476,10 +1872,13 @@ class VJEPA2Inference:
         if is_ac:
             # Use action-conditioned evaluation (same as CEM)
             # encode_images has already cached the patch embeddings for AC models
-            energies_np = self.evaluate_actions_ac(actions_np)
+            energies_np = self.evaluate_actions_ac(torch.from_numpy(actions_np).to(self.device)).cpu().numpy()
         else:
             # Use standard embedding-based evaluation (same as CEM)
-            energies_np = self._evaluate_actions_embedding(current_emb, goal_emb, actions_np)
+            goal_direction_3d = self._prepare_embedding_context(current_emb, goal_emb)
+            energies_np = self._evaluate_actions_embedding(
+                goal_direction_3d, torch.from_numpy(actions_np).to(self.device)
+            ).cpu().numpy()
 
         # Build result
         result_energies = [
@@ -1577,15 +1976,16 @@ class VJEPA2Inference:
             padded[:min(len(action_np), 7)] = action_np[:7]
             action_np = padded
 
-        actions_t = torch.from_numpy(action_np).to(device=self.device, dtype=self.dtype)
-        actions_expanded = actions_t.unsqueeze(0).unsqueeze(0)  # (1, 1, 7)
+        actions_expanded = self._cached_actions[:1]  # (1, 1, 7)
+        actions_expanded[0, 0].copy_(torch.from_numpy(action_np))
 
         # Zero states (proprioceptive state - not used in planning)
-        states = torch.zeros(1, 1, self.ACTION_DIM_AC, device=self.device, dtype=self.dtype)
+        states = self._cached_states[:1]
 
         # Run predictor to get predicted future embedding
-        with autocast(device_type=self.device.type, enabled=(self.device.type == 'mps')):
-            predicted = predictor(current_embedding, actions_expanded, states)
+        rollout_predictor = self._get_rollout_predictor(predictor)
+        with self._maybe_autocast():
+            predicted = rollout_predictor(current_embedding, actions_expanded, states)
 
         return predicted  # (1, num_patches, embed_dim)
 
@@ -1605,9 +2005,14 @@ class VJEPA2Inference:
         This is used for trajectory steps 2+ where we have predicted embeddings
         from the previous step. Avoids expensive image re-encoding.
 
+        The goal embedding is used by reference for every iteration and broadcast
+        against each sample batch, so callers should pass it already on the
+        inference device and contiguous (the trajectory planner prepares it once
+        per trajectory) rather than a per-step copy.
+
         Args:
             current_embedding: Current state embedding (1, num_patches, embed_dim)
-            goal_embedding: Goal state embedding (1, num_patches, embed_dim)
+            goal_embedding: Goal state embedding (1, num_patches, embed_dim), on device and contiguous
             initial_distance: Distance from initial state to goal (for progress tracking)
             num_samples: Number of action samples per iteration
             num_iterations: Number of CEM iterations
@@ -1629,8 +2034,11 @@ class VJEPA2Inference:
         action_range = action_high - action_low
 
         # Initialize action distribution with zeros (AC models use small deltas)
-        action_mean = np.zeros(action_dim, dtype=np.float32)
-        action_std = (action_range / 4).astype(np.float32)
+        # Distribution and bounds live on the device (FP32 statistics)
+        action_mean_t = torch.zeros(action_dim, dtype=torch.float32, device=self.device)
+        action_std_t = torch.as_tensor(action_range / 4, dtype=torch.float32, device=self.device)
+        action_low_t = torch.as_tensor(action_low, dtype=torch.float32, device=self.device)
+        action_high_t = torch.as_tensor(action_high, dtype=torch.float32, device=self.device)
 
         # Pre-allocate arrays for CEM iterations
         energy_history = []
@@ -1647,32 +2055,29 @@ class VJEPA2Inference:
             current_elite_fraction = 0.20 * (1 - progress) + 0.05 * progress
             num_elite = max(1, int(num_samples * current_elite_fraction))
 
-            # Sample actions
-            actions = np.random.normal(
-                loc=action_mean,
-                scale=action_std,
-                size=(num_samples, action_dim)
+            # Sample actions on the device
+            actions = torch.normal(
+                action_mean_t.expand(num_samples, -1),
+                action_std_t.expand(num_samples, -1),
             )
-            np.clip(actions, action_low, action_high, out=actions)
+            actions.clamp_(action_low_t, action_high_t)
 
             # Evaluate using AC predictor
             energies = self.evaluate_actions_ac(actions)
 
             # Select elite samples
-            elite_indices = np.argpartition(energies, num_elite)[:num_elite]
-            sorted_elite_idx = elite_indices[np.argsort(energies[elite_indices])]
-            elite_actions = actions[sorted_elite_idx]
-            elite_energies = energies[sorted_elite_idx]
+            elite_energies, elite_idx = torch.topk(energies, num_elite, largest=False, sorted=True)
+            elite_actions = actions.index_select(0, elite_idx)
 
             # Update distribution
-            np.mean(elite_actions, axis=0, out=action_mean)
-            np.std(elite_actions, axis=0, out=action_std)
-            action_std += 1e-6
+            action_std_t, action_mean_t = torch.std_mean(elite_actions, dim=0, correction=0)
+            action_std_t.add_(1e-6)
 
             # Track best
-            if elite_energies[0] < best_energy:
-                best_energy = elite_energies[0]
-                best_action = elite_actions[0]
+            iteration_best = float(elite_energies[0])
+            if iteration_best < best_energy:
+                best_energy = iteration_best
+                best_action = elite_actions[0].cpu().numpy()
 
             energy_history.append(round(float(best_energy), 3))
 
@@ -1689,6 +2094,7 @@ class VJEPA2Inference:
                 progress_callback(iteration + 1, num_iterations, best_energy, best_action)
 
         elapsed = time.time() - start_time
+        action_std = action_std_t.cpu().numpy()
 
         # Compute confidence with exponential scaling (no saturation)
         final_std = action_std.mean()
@@ -421,7 +421,7 @@ export function SimulatorPage() {
                   <input
                     type="file"
                     id="load-state-input"
-                    accept=".pkl"
+                    accept=".npz"
                     onChange={loadState}
                     className="hidden"
                   />
@@ -649,7 +649,16 @@ export function PlanningProvider({ children }: { children: ReactNode }) {
         const subscription = api.subscribeToTrajectoryProgress(taskId, {
           onProgress: (trajectoryProgress) => {
             console.log('[PlanningContext] Trajectory progress:', trajectoryProgress);
-            setPlanningState((prev) => ({ ...prev, trajectoryProgress }));
+            setPlanningState((prev) => {
+              // Progress carries completed steps as deltas; keep the running list here
+              const previousSteps = trajectoryProgress.completedSteps ?? prev.trajectoryProgress?.completedSteps ?? [];
+              // A snapshot sent on (re)connect may already include the delta's step
+              const newStep = trajectoryProgress.newCompletedStep;
+              const completedSteps = newStep && !previousSteps.some((s) => s.step === newStep.step)
+                ? [...previousSteps, newStep]
+                : previousSteps;
+              return { ...prev, trajectoryProgress: { ...trajectoryProgress, completedSteps } };
+            });
           },
           onComplete: (trajectoryResult) => {
             console.log('[PlanningContext] Trajectory completed:', trajectoryResult);
@@ -155,7 +155,8 @@ export interface TrajectoryProgress {
   samplesEvaluated: number;
   elapsedSeconds: number;
   etaSeconds: number;
-  completedSteps: TrajectoryStep[];
+  completedSteps?: TrajectoryStep[] | null;  // Full list (initial snapshot only)
+  newCompletedStep?: TrajectoryStep | null;  // Step finished since the previous update
   // Simulator mode
   useSimulator: boolean;  // Whether using RoboSuite simulator
   observedImageUrl?: string;  // Current step's observation (real-time)
@@ -1021,6 +1022,24 @@ export const api = {
     });
   },
 
+  async stepSimulatorSequence(actions: number[][]): Promise<{
+    success: boolean;
+    imageBase64: string;
+    robotState?: number[];
+    gripperState?: number[];
+    rewards: number[];
+    reward: number;
+    done: boolean;
+    stepsExecuted: number;
+    transformedActions: number[][];
+    message: string;
+  }> {
+    return fetchJson(`${API_BASE}/simulator/step-sequence`, {
+      method: "POST",
+      body: JSON.stringify({ actions }),
+    });
+  },
+
   async resetSimulator(): Promise<{
     success: boolean;
     imageBase64: string;
@@ -1041,7 +1060,7 @@ export const api = {
   },
 
   /**
-   * Save current simulator state and download as .pkl file.
+   * Save current simulator state and download as .npz file.
    * The file can be loaded later to restore the exact simulator state.
    */
   async saveSimulatorState(): Promise<void> {
@@ -1057,7 +1076,7 @@ export const api = {
     const url = window.URL.createObjectURL(blob);
     const a = document.createElement("a");
     a.href = url;
-    a.download = `simulator_state_${Date.now()}.pkl`;
+    a.download = `simulator_state_${Date.now()}.npz`;
     document.body.appendChild(a);
     a.click();
     document.body.removeChild(a);
@@ -1065,7 +1084,7 @@ export const api = {
   },
 
   /**
-   * Load simulator state from a .pkl file.
+   * Load simulator state from a .npz file.
    * This will restore the simulator to the exact state when saved.
    */
   async loadSimulatorState(file: File): Promise<{
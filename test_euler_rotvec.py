@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the closed-form Euler -> rotation vector conversion.
+
+This script checks _euler_xyz_to_rotvec (used by the RoboSuite action
+transform) against scipy's Rotation.from_euler("xyz", ...).as_rotvec() on:
+1. Random Euler angles
+2. Angles whose rotation is near 0
+3. Angles whose rotation is near pi (where the rotvec sign is ambiguous)
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from app.services.robosuite_sim import _euler_xyz_to_rotvec
+
+
+TOLERANCE = 1e-8
+
+
+def _rotvec_error(euler) -> float:
+    """Max abs difference between our rotvec and scipy's for one Euler triple."""
+    ours = np.array(_euler_xyz_to_rotvec(*euler))
+    expected = Rotation.from_euler("xyz", euler).as_rotvec()
+    error = np.max(np.abs(ours - expected))
+
+    # At an angle of pi, r and -r are the same rotation
+    if abs(np.linalg.norm(expected) - math.pi) < 1e-6:
+        error = min(error, np.max(np.abs(ours + expected)))
+
+    # The rotation itself must match regardless of representation
+    matrix_error = np.max(np.abs(
+        Rotation.from_rotvec(ours).as_matrix() - Rotation.from_euler("xyz", euler).as_matrix()
+    ))
+    return max(error, matrix_error)
+
+
+def test_euler_to_rotvec():
+    """Compare the closed form with scipy on random, near-0 and near-pi angles."""
+    print("=" * 60)
+    print("Testing Euler XYZ -> rotation vector")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    axes = rng.normal(size=(1000, 3))
+    axes /= np.linalg.norm(axes, axis=1, keepdims=True)
+
+    cases = {
+        "random": rng.uniform(-math.pi, math.pi, size=(10000, 3)),
+        "near 0": rng.uniform(-1e-4, 1e-4, size=(1000, 3)),
+        "near pi": np.concatenate([
+            # Single-axis rotations just below, at and just above pi
+            np.array([
+                [math.pi + d, 0.0, 0.0] for d in (-1e-6, -1e-9, 0.0, 1e-9, 1e-6)
+            ] + [
+                [0.0, math.pi + d, 0.0] for d in (-1e-6, -1e-9, 0.0, 1e-9, 1e-6)
+            ] + [
+                [0.0, 0.0, math.pi + d] for d in (-1e-6, -1e-9, 0.0, 1e-9, 1e-6)
+            ]),
+            # Combined rotations of angle ~pi about random axes
+            Rotation.from_rotvec(
+                axes * (math.pi - rng.uniform(0.0, 1e-6, size=(1000, 1)))
+            ).as_euler("xyz"),
+        ]),
+    }
+
+    failures = 0
+    for name, angles in cases.items():
+        errors = np.array([_rotvec_error(euler) for euler in angles])
+        worst = int(np.argmax(errors))
+        ok = errors[worst] <= TOLERANCE
+        failures += int(not ok)
+        status = "✅" if ok else "❌"
+        print(f"\n{status} {name}: {len(angles)} cases, max error {errors[worst]:.2e}")
+        if not ok:
+            print(f"   Worst input: {angles[worst].tolist()}")
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"❌ FAILED: {failures} case group(s) exceeded tolerance {TOLERANCE:.0e}")
+    else:
+        print("✅ SUCCESS: closed form matches scipy")
+    print("=" * 60)
+
+    return failures == 0
+
+
+if __name__ == "__main__":
+    try:
+        passed = test_euler_to_rotvec()
+        sys.exit(0 if passed else 1)
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)